@@ -7,12 +7,38 @@ load_dotenv()
 # === OpenAI / API Configuration ===
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 MODEL_NAME = os.getenv("OPENAI_MODEL", "gpt-4o-mini")  # can adjust later
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")  # e.g. a local OpenAI-compatible stand-in server
+
+# === AI Matching Knobs ===
+MAX_CANDIDATES = int(os.getenv("AI_MAX_CANDIDATES", "0")) or None  # None = send every standard
+BATCH_SIZE = int(os.getenv("AI_BATCH_SIZE", "1"))  # activities per request
+AI_CONCURRENCY = int(os.getenv("AI_CONCURRENCY", "4"))  # parallel requests in streaming mode
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "8"))  # bounded queue depth between streaming stages
+
+# --plan latency model: fixed per-request overhead + prompt processing + generation speed
+EST_REQUEST_OVERHEAD_S = float(os.getenv("EST_REQUEST_OVERHEAD_S", "0.6"))
+EST_INPUT_TOKENS_PER_S = float(os.getenv("EST_INPUT_TOKENS_PER_S", "2500"))
+EST_OUTPUT_TOKENS_PER_S = float(os.getenv("EST_OUTPUT_TOKENS_PER_S", "60"))
+
+# USD per 1M tokens: (input, output). Used for cost estimates only.
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+# Override / add the configured model's price (e.g. a local stand-in: 0 and 0)
+if os.getenv("MODEL_PRICE_INPUT") and os.getenv("MODEL_PRICE_OUTPUT"):
+    MODEL_PRICES[MODEL_NAME] = (float(os.getenv("MODEL_PRICE_INPUT")), float(os.getenv("MODEL_PRICE_OUTPUT")))
 
 # === Data Paths ===
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache")  # reusable parse caches (e.g. PDF text store)
 
 FILES = {
     "REFERENCE_1": os.path.join(DATA_DIR, "_new_ Core National Scope and Sequence.xlsx"),
+    "STANDARDS": os.path.join(DATA_DIR, "[AI Lab] ThinkCERCA - ELA MOAC Standards (INTERNAL).xlsx"),
     "STUDENT_GUIDE": os.path.join(DATA_DIR, "Student Guide Grade 8, Unit 1, Module 2_ “I Am the Greatest” by James Bird.pdf"),
     "SAMPLE_FORMAT": os.path.join(DATA_DIR, "Sample spreadsheet.xlsx"),
 }
@@ -23,6 +49,10 @@ TARGET_UNIT = "Unit 1"
 TARGET_MODULE = "Module 2"
 
 # === Output ===
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "output")  # default output root for every stage
+RUNS_DIR = os.path.join(OUTPUT_DIR, "runs")  # per-run workspaces (main.py --workspace / --run-id)
+ARTIFACT_DB = os.path.join(OUTPUT_DIR, "artifacts.sqlite")  # typed store for all stage results (shared by runs)
+AI_OUTPUT_NAME = "Grade8_Unit1_Module2_Mapped_Standards_AI_Final.xlsx"
 OUTPUT_FILE = os.path.join(DATA_DIR, "Grade8_Unit1_Module2_Mapped_Standards.xlsx")
 # --- Temporary manual PDF→InDesign page offset ---
 PAGE_OFFSET = 31  # Example: Module 2 starts at page 32
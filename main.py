@@ -14,11 +14,20 @@ Pipeline stages:
 Usage:
     python main.py                 → run all, reuse cached results
     python main.py --ai            → include AI mapping
+    python main.py --ai --stream   → AI mapping as a streaming extract → match → aggregate pipeline
+    python main.py --plan          → dry run: estimate AI requests, tokens, cost and time (no API calls)
     python main.py --fresh         → force rerun all steps
     python main.py --indesign-only → skip data & AI, run InDesign only
+    python main.py --proof         → stamp codes onto the Student Guide PDF with PyMuPDF instead of InDesign
+    python main.py watch [--ai]    → stay running, re-run only stages whose data/ inputs changed
+    python main.py evaluate GOLD.csv [--variants V.json] [--replay R.jsonl | --record R.jsonl]
+                                   → compare matcher variants: precision/recall@k vs. tokens, cost, latency
+
+    Add --workspace (or --run-id NAME) to any command to write every artifact to
+    output/runs/<run id>/ instead of output/, so several pipelines can run at once.
 """
 
-import sys, os
+import sys, os, json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
@@ -30,13 +39,16 @@ from thinkcerca_tool.modules import (
     join_standards,
     ai_matcher,
     indesign_bridge,
+    artifact_store,
+    pdf_proof,
+    watcher,
+    evaluation,
+    workspace,
+    streaming,
+    planner,
 )
-from thinkcerca_tool.config import DATA_DIR
-
+from thinkcerca_tool.config import AI_OUTPUT_NAME
 
-# --- Define central output directory ---
-OUTPUT_DIR = Path(DATA_DIR).parent / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
 
 # ---------------------------
 # Helpers
@@ -61,8 +73,8 @@ def load_or_run_csv(path: Path, generator_fn, label: str) -> pd.DataFrame:
 # ---------------------------
 def run_data_pipeline(force=False) -> pd.DataFrame:
     """Run Steps 1–3: load + join standards."""
-    out_path = OUTPUT_DIR / "joined_standards.csv"
-    if force or not file_exists(out_path):
+    df_joined = pd.DataFrame() if force else artifact_store.load_module_standards()
+    if df_joined.empty:
         print("\n📘 Loading reference standards...")
         sheets = standards_loader.load_reference_1()
         df_ref = standards_loader.extract_standards(sheets)
@@ -73,36 +85,80 @@ def run_data_pipeline(force=False) -> pd.DataFrame:
         print(f"✅ Loaded {len(df_desc)} descriptions")
 
         print("\n📙 Joining both datasets...")
-        df_joined = join_standards.join_module_standards()
-        df_joined.to_csv(out_path, index=False)
-        print(f"✅ Joined dataset saved → {out_path}")
+        df_joined = join_standards.join_module_standards(df_ref, df_desc)
     else:
-        df_joined = pd.read_csv(out_path)
-        print(f"♻️  Using cached joined data from {out_path}")
+        print(f"♻️  Using cached joined data from artifact store ({len(df_joined)} rows)")
 
     return df_joined
 
 
-def run_ai_mapping(force=False):
-    """Step 4 — AI mapping pipeline."""
-    ai_out = OUTPUT_DIR / "Grade8_Unit1_Module2_Mapped_Standards_AI_Final.xlsx"
-    if force or not file_exists(ai_out):
+def run_ai_mapping(output_dir: Path, df_joined: pd.DataFrame, force=False, stream=False, jsx_dir: Path = None):
+    """
+    Step 4 — AI mapping pipeline on the joined standards (stream=True overlaps extraction, matching and export).
+    Returns (csv_path, jsx_path) when the streaming run already wrote the InDesign payload, else (None, None).
+    """
+    ai_out = output_dir / AI_OUTPUT_NAME
+    streamed = (None, None)
+    if force or not file_exists(ai_out) or artifact_store.load_matches().empty:
         print("\n🤖 Running AI mapping pipeline...")
-        ai_matcher.run_ai_mapping_pipeline()
+        if stream:
+            jsx_path = indesign_bridge.JSX_FILE if jsx_dir is None else jsx_dir / indesign_bridge.JSX_FILE.name
+            if streaming.run_streaming_pipeline(output_dir, jsx_path, standards_df=df_joined):
+                streamed = (output_dir / indesign_bridge.CSV_NAME, jsx_path)
+        else:
+            ai_matcher.run_ai_mapping_pipeline(output_dir, df_joined)
         print(f"✅ AI mapping completed → {ai_out}")
     else:
         print(f"♻️  Using cached AI mapping results → {ai_out}")
+    return streamed
+
 
+def run_indesign_pipeline(output_dir: Path = None, force=False, streamed_jsx: Path = None):
+    """Step 5 — InDesign automation (output_dir=None keeps the JSX in jsx/)."""
+    if streamed_jsx is not None:
+        print(f"\n🖋️ Launching InDesign with the streamed JSX → {streamed_jsx}")
+        indesign_bridge.run_indesign(streamed_jsx)
+        return
 
-def run_indesign_pipeline(force=False):
-    """Step 5 — InDesign automation."""
-    jsx_path = indesign_bridge.JSX_FILE
+    jsx_path = indesign_bridge.JSX_FILE if output_dir is None else output_dir / indesign_bridge.JSX_FILE.name
     if force or not file_exists(jsx_path):
         print("\n🖋️ Running InDesign full pipeline...")
-        indesign_bridge.run_full_pipeline()
+        indesign_bridge.run_full_pipeline(output_dir)
     else:
         print(f"♻️  JSX already exists at {jsx_path} — launching InDesign only...")
-        indesign_bridge.run_full_pipeline()
+        indesign_bridge.run_full_pipeline(output_dir)
+
+
+def run_proof_pipeline(output_dir: Path, csv_path: Path = None):
+    """Step 5 (Linux-native) — stamp page→codes onto the Student Guide PDF (csv_path: streamed payload)."""
+    print("\n🖨️ Stamping PDF proof...")
+    pdf_proof.stamp_proof_pdf(csv_path, output_dir=output_dir)
+
+
+def option_value(args, flag):
+    """Value following a CLI flag, e.g. --replay path.jsonl → 'path.jsonl'."""
+    if flag in args and args.index(flag) + 1 < len(args):
+        return args[args.index(flag) + 1]
+    return None
+
+
+def run_evaluation(args, output_dir: Path):
+    """Evaluation harness — gold mapping path is the argument after 'evaluate'."""
+    gold_path = option_value(args, "evaluate")
+    if not gold_path:
+        print("❌ Usage: python main.py evaluate GOLD.csv [--variants V.json] [--replay R.jsonl | --record R.jsonl]")
+        return
+    variants = None
+    variants_path = option_value(args, "--variants")
+    if variants_path:
+        variants = json.loads(Path(variants_path).read_text(encoding="utf-8"))
+    evaluation.run_evaluation(
+        gold_path,
+        variants=variants,
+        replay_path=option_value(args, "--replay"),
+        record_path=option_value(args, "--record"),
+        output_dir=output_dir,
+    )
 
 
 # ---------------------------
@@ -113,16 +169,46 @@ def main():
     run_ai = "--ai" in args
     force_fresh = "--fresh" in args
     indesign_only = "--indesign-only" in args
+    proof = "--proof" in args
+    use_workspace = "--workspace" in args or "--run-id" in args
+
+    # --- One run ID per invocation; a workspace isolates its files from other runs ---
+    run_id = option_value(args, "--run-id") or artifact_store.new_run_id()
+    output_dir = workspace.create_workspace(run_id) if use_workspace else workspace.resolve_output_dir()
+    artifact_store.start_run(run_id, output_dir=output_dir)
+    jsx_dir = output_dir if use_workspace else None
+
+    if "watch" in args[1:]:
+        print("\n🚀 Starting ThinkCERCA Automation (watch mode)\n")
+        watcher.watch(run_ai=run_ai, output_dir=output_dir, jsx_dir=jsx_dir)
+        return
+
+    if "--plan" in args:
+        print("\n🚀 Starting ThinkCERCA Automation (dry-run plan)\n")
+        planner.run_plan(output_dir=output_dir)
+        return
+
+    if "evaluate" in args[1:]:
+        print("\n🚀 Starting ThinkCERCA Automation (evaluation)\n")
+        run_evaluation(args, output_dir)
+        return
 
     print("\n🚀 Starting ThinkCERCA Automation\n")
+    # Publishing reuses the CSV/JSX a --stream run already wrote instead of re-exporting them
+    if proof:
+        publish = lambda streamed=(None, None): run_proof_pipeline(output_dir, streamed[0])
+    else:
+        publish = lambda streamed=(None, None): run_indesign_pipeline(jsx_dir, force_fresh, streamed[1])
 
     if indesign_only:
-        run_indesign_pipeline(force_fresh)
+        publish()
     else:
         df_joined = run_data_pipeline(force_fresh)
+        streamed = (None, None)
         if run_ai:
-            run_ai_mapping(force_fresh)
-        run_indesign_pipeline(force_fresh)
+            streamed = run_ai_mapping(output_dir, df_joined, force_fresh, "--stream" in args, jsx_dir)
+        artifact_store.export_views(output_dir)
+        publish(streamed)
 
     print("\n🎉 All steps finished successfully!\n")
 
@@ -2,7 +2,6 @@ import os
 import re
 import json
 import pandas as pd
-import fitz  # PyMuPDF
 from tqdm import tqdm
 from openai import OpenAI
 from pathlib import Path
@@ -17,69 +16,102 @@ from thinkcerca_tool.config import (
     OUTPUT_FILE,
     MODEL_NAME,
     OPENAI_API_KEY,
-    DATA_DIR,
+    OPENAI_BASE_URL,
+    MAX_CANDIDATES,
+    BATCH_SIZE,
+    AI_OUTPUT_NAME,
     TARGET_MODULE,
 )
-from thinkcerca_tool.modules.join_standards import join_module_standards
-
-# --- Output directory ---
-OUTPUT_DIR = Path(DATA_DIR).parent / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
+from thinkcerca_tool.modules import artifact_store
+from thinkcerca_tool.modules.join_standards import load_joined_standards
+from thinkcerca_tool.modules.pdf_text_store import open_text_store
+from thinkcerca_tool.modules.workspace import resolve_output_dir, atomic_path
 
 
 # ============================================================
 #  PDF ACTIVITY EXTRACTION
 # ============================================================
-def extract_pdf_activities(pdf_path: str = FILES["STUDENT_GUIDE"]) -> list[dict]:
+def iter_page_activities(pdf_path: str = FILES["STUDENT_GUIDE"]):
     """
-    Extracts text chunks from the Student Guide PDF.
+    Yields (page number, [activities on that page]) one page at a time.
     Applies a fixed PAGE_OFFSET to align PDF numbering with InDesign layout.
+    Page text is read lazily from the PDF text store (parsed once per document hash).
     """
     from thinkcerca_tool.config import PAGE_OFFSET
 
-    doc = fitz.open(pdf_path)
-    activities = []
+    store = open_text_store(pdf_path)
 
-    for page_idx, page in enumerate(doc):
-        text = page.get_text("text")
+    for page_idx, text in store.iter_pages():
+        true_page_num = page_idx + 1 + PAGE_OFFSET  # ← fixed offset
         chunks = [c.strip() for c in text.split("\n\n") if len(c.strip()) > 60]
+        page_activities = []
         for chunk in chunks:
             first_line = chunk.split("\n")[0][:80]
-            true_page_num = page_idx + 1 + PAGE_OFFSET  # ← fixed offset
-            activities.append(
+            page_activities.append(
                 {
                     "page": true_page_num,
                     "heading": first_line,
                     "text": chunk,
                 }
             )
+        yield true_page_num, page_activities
+
+
+def extract_pdf_activities(pdf_path: str = FILES["STUDENT_GUIDE"]) -> list[dict]:
+    """
+    Extracts text chunks from the Student Guide PDF.
+    Applies a fixed PAGE_OFFSET to align PDF numbering with InDesign layout.
+    """
+    from thinkcerca_tool.config import PAGE_OFFSET
+
+    activities = [act for _, page_acts in iter_page_activities(pdf_path) for act in page_acts]
 
+    artifact_store.save_activities(activities)
     print(f"✅ Extracted {len(activities)} activities (offset +{PAGE_OFFSET})")
     return activities
 
 
 # ============================================================
-#  AI STANDARD MATCHING
+#  PROMPT BUILDING
 # ============================================================
-def match_standards_with_ai(
-    activities: list[dict],
-    standards_df: pd.DataFrame,
-    model: str = MODEL_NAME,
-    top_k: int = 2,
-) -> pd.DataFrame:
-    """
-    Uses GPT to match each activity with relevant standards.
-    Returns DataFrame with columns: [Page, Activity, Standard Code, Reason].
-    """
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    results = []
+_WORD_RE = re.compile(r"[a-z]{4,}")
 
-    standards_text = "\n".join(
+
+def make_client() -> OpenAI:
+    """OpenAI client; OPENAI_BASE_URL points it at a local stand-in server if set."""
+    return OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL or None)
+
+
+def format_standards_text(standards_df: pd.DataFrame) -> str:
+    return "\n".join(
         f"{row.Standard_Code}: {row.Description}" for _, row in standards_df.iterrows()
     )
 
-    for act in tqdm(activities, desc="AI Matching"):
-        prompt = f"""
+
+def prune_candidates(text: str, standards_df: pd.DataFrame, max_candidates: int = None) -> pd.DataFrame:
+    """
+    Keep the max_candidates standards whose descriptions share the most words
+    with the activity text. None/0 keeps the full list unchanged.
+    """
+    if not max_candidates:
+        return standards_df
+    unique_df = standards_df.drop_duplicates(subset=["Standard_Code"])
+    if len(unique_df) <= max_candidates:
+        return unique_df
+
+    words = set(_WORD_RE.findall(text.lower()))
+    scores = unique_df["Description"].astype(str).str.lower().map(
+        lambda d: len(words & set(_WORD_RE.findall(d)))
+    )
+    keep = scores.sort_values(ascending=False, kind="stable").index[:max_candidates]
+    return unique_df.loc[sorted(keep)]
+
+
+def build_prompt(batch: list[dict], standards_text: str, top_k: int) -> str:
+    """Prompt for one request: the original single-activity prompt, or a numbered batch."""
+    if len(batch) == 1:
+        act = batch[0]
+        return f"""
         You are aligning student activities with educational standards.
 
         Activity (from Student Guide page {act['page']}):
@@ -98,27 +130,128 @@ def match_standards_with_ai(
           ]
         }}
         """
-        try:
-            resp = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,
-            )
-            content = resp.choices[0].message.content.strip()
-
-            # --- Try parsing JSON safely ---
-            try:
-                data = json.loads(content)
-            except json.JSONDecodeError:
-                match = re.search(r"\{.*\}", content, re.DOTALL)
-                if match:
-                    data = json.loads(match.group(0))
-                else:
-                    print(f"⚠️ Could not parse GPT output for page {act['page']}")
-                    continue
-
-            for m in data.get("matches", []):
-                results.append(
+
+    activities_text = "\n\n".join(
+        f"Activity {i} (from Student Guide page {act['page']}):\n\"\"\"{act['text'][:2000]}\"\"\""
+        for i, act in enumerate(batch, start=1)
+    )
+    return f"""
+        You are aligning student activities with educational standards.
+
+        {activities_text}
+
+        Candidate Standards:
+        {standards_text}
+
+        For EACH activity, pick the {top_k} most relevant standard codes.
+        Return valid JSON only:
+        {{
+          "results": [
+            {{
+              "index": <activity number>,
+              "matches": [
+                {{"code": "<standard code>", "reason": "<why this matches>"}}
+              ]
+            }}
+          ]
+        }}
+        """
+
+
+def build_requests(
+    activities: list[dict],
+    standards_df: pd.DataFrame,
+    top_k: int = 2,
+    max_candidates: int = MAX_CANDIDATES,
+    batch_size: int = BATCH_SIZE,
+) -> list[tuple[list[dict], str]]:
+    """
+    Every (batch, prompt) pair match_standards_with_ai would send, in order.
+    With pruning + batching, a batch's candidates are the union of each activity's pruned set.
+    """
+    batch_size = max(1, batch_size or 1)
+    full_text = None if max_candidates else format_standards_text(standards_df)
+
+    requests = []
+    for i in range(0, len(activities), batch_size):
+        batch = activities[i:i + batch_size]
+        if full_text is not None:
+            standards_text = full_text
+        else:
+            candidates = pd.concat(
+                [prune_candidates(act["text"], standards_df, max_candidates) for act in batch]
+            ).drop_duplicates(subset=["Standard_Code"])
+            standards_text = format_standards_text(candidates)
+        requests.append((batch, build_prompt(batch, standards_text, top_k)))
+    return requests
+
+
+def _parse_json(content: str):
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        match = re.search(r"\{.*\}", content, re.DOTALL)
+        if match:
+            return json.loads(match.group(0))
+    return None
+
+
+def _unpack_matches(data: dict, batch: list[dict]) -> list[tuple[dict, list]]:
+    """Pair each activity in the batch with its list of {"code", "reason"} matches."""
+    if len(batch) == 1:
+        return [(batch[0], data.get("matches", []))]
+    pairs = []
+    for item in data.get("results", []):
+        idx = item.get("index")
+        if isinstance(idx, int) and 1 <= idx <= len(batch):
+            pairs.append((batch[idx - 1], item.get("matches", [])))
+    return pairs
+
+
+def _record_usage(usage: dict, resp):
+    if usage is None:
+        return
+    usage["requests"] = usage.get("requests", 0) + 1
+    resp_usage = getattr(resp, "usage", None)
+    usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + (getattr(resp_usage, "prompt_tokens", 0) or 0)
+    usage["completion_tokens"] = usage.get("completion_tokens", 0) + (getattr(resp_usage, "completion_tokens", 0) or 0)
+
+
+# ============================================================
+#  AI STANDARD MATCHING
+# ============================================================
+def match_batch(
+    client,
+    batch: list[dict],
+    prompt: str,
+    model: str = MODEL_NAME,
+    usage: dict = None,
+    answered: list = None,
+) -> list[dict]:
+    """
+    Send one prepared request and return its match rows
+    ([Page, Activity, Standard Code, Reason] dicts). Errors are logged, not raised.
+    Activities that got a parsed reply are appended to answered, if given.
+    """
+    rows = []
+    try:
+        resp = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+        )
+        _record_usage(usage, resp)
+        content = resp.choices[0].message.content.strip()
+
+        # --- Try parsing JSON safely ---
+        data = _parse_json(content)
+        if data is None:
+            print(f"⚠️ Could not parse GPT output for page {batch[0]['page']}")
+            return rows
+
+        for act, matches in _unpack_matches(data, batch):
+            for m in matches:
+                rows.append(
                     {
                         "Page": act["page"],
                         "Activity": act["heading"],
@@ -126,24 +259,64 @@ def match_standards_with_ai(
                         "Reason": m.get("reason", "").strip(),
                     }
                 )
+            if answered is not None:
+                answered.append(act)
+
+    except Exception as e:
+        print(f"⚠️ Error on page {batch[0]['page']}: {e}")
+    return rows
 
-        except Exception as e:
-            print(f"⚠️ Error on page {act['page']}: {e}")
 
-    df = pd.DataFrame(results)
-    out_csv = OUTPUT_DIR / "ai_raw_matches.csv"
-    df.to_csv(out_csv, index=False)
-    print(f"✅ Raw AI matches saved → {out_csv}")
+def match_standards_with_ai(
+    activities: list[dict],
+    standards_df: pd.DataFrame,
+    model: str = MODEL_NAME,
+    top_k: int = 2,
+    save_raw: bool = True,
+    max_candidates: int = MAX_CANDIDATES,
+    batch_size: int = BATCH_SIZE,
+    client=None,
+    usage: dict = None,
+    answered: list = None,
+) -> pd.DataFrame:
+    """
+    Uses GPT to match each activity with relevant standards.
+    Returns DataFrame with columns: [Page, Activity, Standard Code, Reason].
+    Set save_raw=False when matching a subset or experimenting (nothing is stored).
+
+    max_candidates prunes the standards list per activity, batch_size packs several
+    activities into one request. Pass a client to replay recorded responses, a
+    dict as usage to collect request/token counts, and a list as answered to
+    collect the activities whose request succeeded (failed ones are only logged).
+    """
+    if client is None:
+        client = make_client()
+    results = []
+
+    requests = build_requests(activities, standards_df, top_k, max_candidates, batch_size)
+
+    for batch, prompt in tqdm(requests, desc="AI Matching"):
+        results.extend(match_batch(client, batch, prompt, model, usage, answered))
+
+    df = pd.DataFrame(results, columns=["Page", "Activity", "Standard Code", "Reason"])
+    if save_raw:
+        artifact_store.save_matches(df)
+        print(f"✅ Raw AI matches saved → artifact store ({len(df)} rows)")
     return df
 
 
 # ============================================================
 #  PIPELINE EXECUTION
 # ============================================================
-def run_ai_mapping_pipeline():
-    """Runs full AI mapping flow and preserves numeric page numbers."""
-    print("🔍 Loading module-specific standards...")
-    standards_df = join_module_standards()
+def run_ai_mapping_pipeline(output_dir: Path = None, standards_df: pd.DataFrame = None) -> Path:
+    """
+    Runs full AI mapping flow and preserves numeric page numbers.
+    The final workbook is written under output_dir (default: output/).
+    standards_df is the joined module standards; read from the artifact store if omitted.
+    """
+    if standards_df is None:
+        print("🔍 Loading module-specific standards...")
+        standards_df = load_joined_standards()
 
     print("📘 Extracting student-guide activities...")
     activities = extract_pdf_activities()
@@ -153,7 +326,26 @@ def run_ai_mapping_pipeline():
 
     if matches_df.empty:
         print("⚠️ No matches returned — check AI output.")
-        return
+        return None
+
+    return write_mapping_workbook(matches_df, standards_df, activities, output_dir)
+
+
+# ============================================================
+#  WORKBOOK OUTPUT
+# ============================================================
+def write_mapping_workbook(
+    matches_df: pd.DataFrame,
+    standards_df: pd.DataFrame,
+    activities: list[dict],
+    output_dir: Path = None,
+) -> Path:
+    """
+    Formats raw AI matches into the final "Mapped Standards" workbook
+    (plus a Summary sheet) and returns its path.
+    """
+    output_path = resolve_output_dir(output_dir) / AI_OUTPUT_NAME
+    matches_df = matches_df.copy()
 
     print("🧾 Formatting final workbook...")
 
@@ -188,49 +380,49 @@ def run_ai_mapping_pipeline():
     ]
     merged = merged[[c for c in col_order if c in merged.columns]]
 
-    # --- Save Excel ---
-    output_path = OUTPUT_DIR / "Grade8_Unit1_Module2_Mapped_Standards_AI_Final.xlsx"
-
-    with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
-        merged.to_excel(writer, index=False, sheet_name="Mapped Standards")
-
-        summary_data = {
-            "Project": ["ThinkCERCA AI Standards Alignment"],
-            "Grade": ["8"],
-            "Unit": ["1"],
-            "Module": ["2 – 'I Am the Greatest'"],
-            "Date": [datetime.now().strftime("%Y-%m-%d")],
-            "Total Unique Activities": [merged["Activity"].nunique()],
-            "Total Unique Standards": [merged["Standard Code"].nunique()],
-            "Total Activity–Standard Pairs": [len(merged)],
-            "Model Used": [MODEL_NAME],
-            "Notes": [
-                "Each row links one Activity to one or more Standards. "
-                "Page numbers are auto-detected by scanning for the module start in the Student Guide PDF."
-            ],
-        }
-        pd.DataFrame(summary_data).T.rename(columns={0: "Details"}).to_excel(
-            writer, sheet_name="Summary"
-        )
+    # Write + beautify a temp copy, then rename into place
+    with atomic_path(output_path) as tmp_path:
+        with pd.ExcelWriter(tmp_path, engine="openpyxl") as writer:
+            merged.to_excel(writer, index=False, sheet_name="Mapped Standards")
+
+            summary_data = {
+                "Project": ["ThinkCERCA AI Standards Alignment"],
+                "Grade": ["8"],
+                "Unit": ["1"],
+                "Module": ["2 – 'I Am the Greatest'"],
+                "Date": [datetime.now().strftime("%Y-%m-%d")],
+                "Total Unique Activities": [merged["Activity"].nunique()],
+                "Total Unique Standards": [merged["Standard Code"].nunique()],
+                "Total Activity–Standard Pairs": [len(merged)],
+                "Model Used": [MODEL_NAME],
+                "Notes": [
+                    "Each row links one Activity to one or more Standards. "
+                    "Page numbers are auto-detected by scanning for the module start in the Student Guide PDF."
+                ],
+            }
+            pd.DataFrame(summary_data).T.rename(columns={0: "Details"}).to_excel(
+                writer, sheet_name="Summary"
+            )
 
-    # --- Beautify workbook ---
-    wb = load_workbook(output_path)
-    ws = wb["Mapped Standards"]
+        # --- Beautify workbook ---
+        wb = load_workbook(tmp_path)
+        ws = wb["Mapped Standards"]
 
-    header_font = Font(bold=True)
-    for cell in ws[1]:
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        header_font = Font(bold=True)
+        for cell in ws[1]:
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal="center", vertical="center")
 
-    for col in ws.columns:
-        max_len = 0
-        col_letter = get_column_letter(col[0].column)
-        for cell in col:
-            if cell.value:
-                max_len = max(max_len, len(str(cell.value)))
-        ws.column_dimensions[col_letter].width = min(max_len + 3, 60)
+        for col in ws.columns:
+            max_len = 0
+            col_letter = get_column_letter(col[0].column)
+            for cell in col:
+                if cell.value:
+                    max_len = max(max_len, len(str(cell.value)))
+            ws.column_dimensions[col_letter].width = min(max_len + 3, 60)
 
-    ws.freeze_panes = "A2"
-    wb.save(output_path)
+        ws.freeze_panes = "A2"
+        wb.save(tmp_path)
 
     print(f"✅ Final Excel with accurate page numbers → {output_path}")
+    return output_path
@@ -0,0 +1,296 @@
+import uuid
+import sqlite3
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from thinkcerca_tool.modules.workspace import atomic_write_csv
+from thinkcerca_tool.config import (
+    ARTIFACT_DB,
+    OUTPUT_DIR,
+    MODEL_NAME,
+    TARGET_GRADE,
+    TARGET_UNIT,
+    TARGET_MODULE,
+)
+
+# --- Scope keys used to index rows ---
+GRADE_KEY = TARGET_GRADE
+MODULE_KEY = f"{TARGET_GRADE}, {TARGET_UNIT}, {TARGET_MODULE}"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    started_at  TEXT NOT NULL,
+    module      TEXT NOT NULL,
+    model       TEXT,
+    output_dir  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS standards (
+    run_id      TEXT NOT NULL REFERENCES runs(run_id),
+    grade       TEXT NOT NULL,
+    code        TEXT NOT NULL,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_standards_code ON standards(code);
+CREATE INDEX IF NOT EXISTS ix_standards_run ON standards(run_id, grade);
+
+CREATE TABLE IF NOT EXISTS module_contexts (
+    run_id        TEXT NOT NULL REFERENCES runs(run_id),
+    module        TEXT NOT NULL,
+    sheet         TEXT,
+    row           INTEGER,
+    context_above TEXT,
+    context_row   TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_module_contexts_module ON module_contexts(module, run_id);
+
+CREATE TABLE IF NOT EXISTS module_standards (
+    run_id      TEXT NOT NULL REFERENCES runs(run_id),
+    module      TEXT NOT NULL,
+    sheet       TEXT,
+    context_row TEXT,
+    code        TEXT,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_module_standards_module ON module_standards(module, run_id);
+CREATE INDEX IF NOT EXISTS ix_module_standards_code ON module_standards(code);
+
+CREATE TABLE IF NOT EXISTS activities (
+    run_id  TEXT NOT NULL REFERENCES runs(run_id),
+    module  TEXT NOT NULL,
+    page    INTEGER NOT NULL,
+    seq     INTEGER NOT NULL,
+    heading TEXT,
+    text    TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_activities_module ON activities(module, run_id);
+CREATE INDEX IF NOT EXISTS ix_activities_page ON activities(page);
+
+CREATE TABLE IF NOT EXISTS matches (
+    run_id   TEXT NOT NULL REFERENCES runs(run_id),
+    module   TEXT NOT NULL,
+    page     INTEGER,
+    activity TEXT,
+    code     TEXT,
+    reason   TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_matches_module ON matches(module, run_id);
+CREATE INDEX IF NOT EXISTS ix_matches_page ON matches(page);
+CREATE INDEX IF NOT EXISTS ix_matches_code ON matches(code);
+"""
+
+# Active run for this process and its output root (set by start_run, created lazily otherwise)
+_CURRENT_RUN_ID = None
+_CURRENT_OUTPUT_DIR = None
+
+
+@contextmanager
+def connect(db_path=None):
+    """Open the artifact DB (schema ensured, WAL so parallel runs can share it)."""
+    db_path = Path(db_path or ARTIFACT_DB)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _migrate(conn):
+    """Add columns introduced after a DB was first created."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+    if "output_dir" not in columns:
+        conn.execute("ALTER TABLE runs ADD COLUMN output_dir TEXT")
+
+
+# ============================================================
+#  RUNS
+# ============================================================
+def new_run_id() -> str:
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def _output_root(output_dir=None) -> str:
+    return str(Path(output_dir or OUTPUT_DIR).resolve())
+
+
+def start_run(run_id: str = None, model: str = MODEL_NAME, output_dir=None) -> str:
+    """
+    Register a new pipeline run and make it the process's current run.
+    output_dir is where the run writes its files (default output/); readers only
+    fall back to earlier runs that wrote to the same place.
+    """
+    global _CURRENT_RUN_ID, _CURRENT_OUTPUT_DIR
+    run_id = run_id or new_run_id()
+    output_root = _output_root(output_dir)
+    with connect() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO runs (run_id, started_at, module, model, output_dir) VALUES (?, ?, ?, ?, ?)",
+            (run_id, datetime.now().isoformat(timespec="microseconds"), MODULE_KEY, model, output_root),
+        )
+    _CURRENT_RUN_ID, _CURRENT_OUTPUT_DIR = run_id, output_root
+    print(f"🆔 Run {run_id}")
+    return run_id
+
+
+def current_run_id() -> str:
+    return _CURRENT_RUN_ID or start_run()
+
+
+def _latest_run(conn, table: str, scope_col: str, scope_val: str, output_root: str):
+    """Most recent run with the same output root that wrote rows to table for this scope (grade or module)."""
+    row = conn.execute(
+        f"""
+        SELECT r.run_id FROM runs r
+        WHERE r.output_dir = ?
+          AND EXISTS (SELECT 1 FROM {table} t WHERE t.run_id = r.run_id AND t.{scope_col} = ?)
+        ORDER BY r.started_at DESC LIMIT 1
+        """,
+        (output_root, scope_val),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _replace_rows(table: str, scope_col: str, scope_val: str, columns: list, rows: list):
+    """Bulk-replace this run's rows for one scope in a single transaction."""
+    run_id = current_run_id()
+    placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+    with connect() as conn:
+        conn.execute(f"DELETE FROM {table} WHERE run_id = ? AND {scope_col} = ?", (run_id, scope_val))
+        conn.executemany(
+            f"INSERT INTO {table} (run_id, {scope_col}, {', '.join(columns)}) VALUES ({placeholders})",
+            [(run_id, scope_val, *r) for r in rows],
+        )
+
+
+def _read_rows(table: str, scope_col: str, scope_val: str, select_sql: str, run_id: str = None) -> pd.DataFrame:
+    with connect() as conn:
+        # Prefer this process's run; otherwise only reuse runs that wrote to the same
+        # output root, so workspaces and parallel runs never read each other's rows
+        if run_id is None and _CURRENT_RUN_ID is not None:
+            has_rows = conn.execute(
+                f"SELECT 1 FROM {table} WHERE run_id = ? AND {scope_col} = ? LIMIT 1",
+                (_CURRENT_RUN_ID, scope_val),
+            ).fetchone()
+            run_id = _CURRENT_RUN_ID if has_rows else None
+        run_id = run_id or _latest_run(conn, table, scope_col, scope_val, _CURRENT_OUTPUT_DIR or _output_root())
+        if run_id is None:
+            return pd.DataFrame()
+        return pd.read_sql_query(
+            f"SELECT {select_sql} FROM {table} WHERE run_id = ? AND {scope_col} = ? ORDER BY rowid",
+            conn,
+            params=(run_id, scope_val),
+        )
+
+
+def _text(value) -> str:
+    return "" if pd.isna(value) else str(value)
+
+
+# ============================================================
+#  WRITERS (one per stage)
+# ============================================================
+def save_standards(df: pd.DataFrame):
+    """Grade-level CCSS descriptions: [Standard_Code, Description]."""
+    rows = [(_text(r.Standard_Code), _text(r.Description)) for r in df.itertuples(index=False)]
+    _replace_rows("standards", "grade", GRADE_KEY, ["code", "description"], rows)
+
+
+def save_module_contexts(df: pd.DataFrame):
+    """Scope-and-sequence rows for the module: [sheet, row, context_above, context_row]."""
+    rows = [
+        (_text(r.sheet), int(r.row), _text(r.context_above), _text(r.context_row))
+        for r in df.itertuples(index=False)
+    ]
+    _replace_rows("module_contexts", "module", MODULE_KEY, ["sheet", "row", "context_above", "context_row"], rows)
+
+
+def save_module_standards(df: pd.DataFrame):
+    """Joined module standards: [sheet, context_row, Standard_Code, Description]."""
+    rows = [
+        (_text(r.sheet), _text(r.context_row), _text(r.Standard_Code), _text(r.Description))
+        for r in df.itertuples(index=False)
+    ]
+    _replace_rows("module_standards", "module", MODULE_KEY, ["sheet", "context_row", "code", "description"], rows)
+
+
+def save_activities(activities: list[dict]):
+    """Student Guide chunks: {page, heading, text}; seq keeps extraction order."""
+    rows = [(int(a["page"]), i, a["heading"], a["text"]) for i, a in enumerate(activities)]
+    _replace_rows("activities", "module", MODULE_KEY, ["page", "seq", "heading", "text"], rows)
+
+
+def save_matches(df: pd.DataFrame):
+    """Raw AI matches: [Page, Activity, Standard Code, Reason]."""
+    rows = [
+        (int(page), _text(activity), _text(code), _text(reason))
+        for page, activity, code, reason in df[["Page", "Activity", "Standard Code", "Reason"]].itertuples(index=False)
+    ]
+    _replace_rows("matches", "module", MODULE_KEY, ["page", "activity", "code", "reason"], rows)
+
+
+# ============================================================
+#  READERS (this run, else the latest run with the same output root, unless run_id given)
+# ============================================================
+def load_standards(run_id: str = None) -> pd.DataFrame:
+    return _read_rows(
+        "standards", "grade", GRADE_KEY,
+        "code AS Standard_Code, description AS Description", run_id,
+    )
+
+
+def load_module_contexts(run_id: str = None) -> pd.DataFrame:
+    return _read_rows(
+        "module_contexts", "module", MODULE_KEY,
+        "sheet, row, context_above, context_row", run_id,
+    )
+
+
+def load_module_standards(run_id: str = None) -> pd.DataFrame:
+    return _read_rows(
+        "module_standards", "module", MODULE_KEY,
+        "sheet, context_row, code AS Standard_Code, description AS Description", run_id,
+    )
+
+
+def load_activities(run_id: str = None) -> list[dict]:
+    df = _read_rows("activities", "module", MODULE_KEY, "page, heading, text", run_id)
+    return df.to_dict("records")
+
+
+def load_matches(run_id: str = None) -> pd.DataFrame:
+    return _read_rows(
+        "matches", "module", MODULE_KEY,
+        'page AS "Page", activity AS "Activity", code AS "Standard Code", reason AS "Reason"', run_id,
+    )
+
+
+# ============================================================
+#  CSV EXPORT VIEWS
+# ============================================================
+EXPORT_VIEWS = {
+    "extracted_standards.csv": load_module_contexts,
+    "grade8_standard_descriptions.csv": load_standards,
+    "joined_standards.csv": load_module_standards,
+    "ai_raw_matches.csv": load_matches,
+}
+
+
+def export_views(output_dir: Path) -> list[Path]:
+    """Write the legacy intermediate CSVs from the latest stored rows."""
+    written = []
+    for name, loader in EXPORT_VIEWS.items():
+        df = loader()
+        if df.empty:
+            continue
+        written.append(atomic_write_csv(df, Path(output_dir) / name))
+    if written:
+        print(f"✅ Exported {len(written)} CSV views → {Path(output_dir)}")
+    return written
@@ -0,0 +1,260 @@
+import re
+import json
+import time
+import hashlib
+import pandas as pd
+from pathlib import Path
+from types import SimpleNamespace
+from thinkcerca_tool.config import MODEL_NAME, MODEL_PRICES, MAX_CANDIDATES, BATCH_SIZE
+from thinkcerca_tool.modules.join_standards import load_joined_standards
+from thinkcerca_tool.modules.ai_matcher import extract_pdf_activities, match_standards_with_ai, make_client
+from thinkcerca_tool.modules.workspace import resolve_output_dir, atomic_write_csv
+
+# Baseline plus the cheaper knobs we usually want to compare against it
+DEFAULT_VARIANTS = [
+    {"name": "baseline", "model": MODEL_NAME, "top_k": 2, "max_candidates": MAX_CANDIDATES, "batch_size": BATCH_SIZE},
+    {"name": "pruned-15", "model": MODEL_NAME, "top_k": 2, "max_candidates": 15, "batch_size": 1},
+    {"name": "batched-4", "model": MODEL_NAME, "top_k": 2, "max_candidates": None, "batch_size": 4},
+    {"name": "pruned-15-batched-4", "model": MODEL_NAME, "top_k": 2, "max_candidates": 15, "batch_size": 4},
+]
+
+
+# ============================================================
+#  RECORD / REPLAY CLIENTS
+# ============================================================
+def _request_key(model: str, messages: list) -> str:
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _fake_response(content: str, prompt_tokens: int, completion_tokens: int):
+    """Minimal object shaped like an OpenAI chat completion."""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+    )
+
+
+class RecordingClient:
+    """Wraps a live client and appends every response to a JSONL file for later replay."""
+
+    def __init__(self, path, client=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._client = client or make_client()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        start = time.perf_counter()
+        resp = self._client.chat.completions.create(model=model, messages=messages, **kwargs)
+        usage = getattr(resp, "usage", None)
+        record = {
+            "key": _request_key(model, messages),
+            "model": model,
+            "content": resp.choices[0].message.content,
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+            "latency_s": round(time.perf_counter() - start, 4),
+        }
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return resp
+
+
+class ReplayClient:
+    """
+    Serves recorded responses keyed by (model, messages); no network access.
+    Unknown requests raise KeyError, which the matcher logs and skips.
+    """
+
+    def __init__(self, path):
+        self.records = {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self.records[record["key"]] = record
+        self.misses = 0
+        self.recorded_latency_s = 0.0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        record = self.records.get(_request_key(model, messages))
+        if record is None:
+            self.misses += 1
+            raise KeyError(f"no recorded response for this {model} request")
+        self.recorded_latency_s += record.get("latency_s", 0.0)
+        return _fake_response(record["content"], record["prompt_tokens"], record["completion_tokens"])
+
+
+# ============================================================
+#  GOLD STANDARD + METRICS
+# ============================================================
+def _normalize_code(code) -> str:
+    code = str(code).strip().upper()
+    if not code or code == "NAN":
+        return ""
+    return code if code.startswith("CCSS.") else f"CCSS.{code}"
+
+
+def load_gold_mapping(path) -> dict:
+    """
+    Read a gold activity→standard file (CSV or XLSX).
+    Needs 'Page' and 'Standard Code' columns; 'Activity' is optional.
+    Codes may be one per row or joined with ',' / ';' (standards_for_indesign.csv works as-is).
+    Returns {unit: set(codes)} where unit is (page, activity) or (page, None).
+    """
+    path = Path(path)
+    df = pd.read_excel(path) if path.suffix.lower() in (".xlsx", ".xls") else pd.read_csv(path)
+    missing = {"Page", "Standard Code"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Gold mapping is missing columns {sorted(missing)} → {path}")
+
+    use_activity = "Activity" in df.columns
+    gold = {}
+    for _, row in df.iterrows():
+        if pd.isna(row["Page"]):
+            continue
+        unit = (int(row["Page"]), str(row["Activity"]).strip() if use_activity else None)
+        codes = {_normalize_code(c) for c in re.split(r"[,;]", str(row["Standard Code"]))}
+        gold.setdefault(unit, set()).update(c for c in codes if c)
+    return gold
+
+
+def _ranked_predictions(matches_df: pd.DataFrame) -> dict:
+    """{(page, activity): [codes in the order the model returned them]}"""
+    ranked = {}
+    for _, row in matches_df.iterrows():
+        unit = (int(row["Page"]), str(row["Activity"]).strip())
+        code = _normalize_code(row["Standard Code"])
+        codes = ranked.setdefault(unit, [])
+        if code and code not in codes:
+            codes.append(code)
+    return ranked
+
+
+def precision_recall_at_k(matches_df: pd.DataFrame, gold: dict, k: int) -> tuple:
+    """
+    Mean precision and recall over the gold units (units with no prediction score 0).
+
+    Activity-level gold: classic precision@k / recall@k on each activity's top k codes.
+    Page-level gold (e.g. standards_for_indesign.csv): every activity on the page keeps
+    its top k codes, their union is the page's predicted set, and precision/recall are
+    set precision/recall of that set — the same codes the footer would show.
+    """
+    if not gold:
+        return float("nan"), float("nan")
+    by_activity = any(activity is not None for _, activity in gold)
+    ranked = _ranked_predictions(matches_df)
+
+    if by_activity:
+        predicted = {unit: set(codes[:k]) for unit, codes in ranked.items()}
+    else:
+        predicted = {}
+        for (page, _), codes in ranked.items():
+            predicted.setdefault((page, None), set()).update(codes[:k])
+
+    precisions, recalls = [], []
+    for unit, expected in gold.items():
+        top = predicted.get(unit, set())
+        hits = len(top & expected)
+        denominator = k if by_activity else len(top)
+        precisions.append(hits / denominator if denominator else 0.0)
+        recalls.append(hits / len(expected) if expected else 0.0)
+    return sum(precisions) / len(precisions), sum(recalls) / len(recalls)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost from MODEL_PRICES; NaN when the model has no configured price."""
+    if model not in MODEL_PRICES:
+        return float("nan")
+    in_price, out_price = MODEL_PRICES[model]
+    return (prompt_tokens * in_price + completion_tokens * out_price) / 1_000_000
+
+
+# ============================================================
+#  HARNESS
+# ============================================================
+def run_evaluation(
+    gold_path,
+    variants: list[dict] = None,
+    k: int = 2,
+    replay_path=None,
+    record_path=None,
+    activities: list[dict] = None,
+    standards_df: pd.DataFrame = None,
+    output_dir: Path = None,
+) -> pd.DataFrame:
+    """
+    Run every variant of match_standards_with_ai against the same activities and
+    standards, score it against the gold mapping, and return one comparison table.
+
+    replay_path → serve recorded responses (fully offline)
+    record_path → call the configured endpoint and record responses for later replay
+    neither     → call the configured endpoint (OPENAI_BASE_URL may point at a local server)
+    """
+    variants = variants or DEFAULT_VARIANTS
+    gold = load_gold_mapping(gold_path)
+    print(f"📏 Loaded gold mapping: {len(gold)} units, {sum(len(v) for v in gold.values())} codes")
+
+    if standards_df is None:
+        standards_df = load_joined_standards()
+    if activities is None:
+        activities = extract_pdf_activities()
+
+    rows = []
+    for variant in variants:
+        name = variant.get("name", variant.get("model", MODEL_NAME))
+        model = variant.get("model", MODEL_NAME)
+        print(f"\n🧪 Variant '{name}'...")
+
+        if replay_path:
+            client = ReplayClient(replay_path)
+        elif record_path:
+            client = RecordingClient(record_path)
+        else:
+            client = make_client()
+
+        usage = {}
+        start = time.perf_counter()
+        matches_df = match_standards_with_ai(
+            activities,
+            standards_df,
+            model=model,
+            top_k=variant.get("top_k", 2),
+            save_raw=False,
+            max_candidates=variant.get("max_candidates"),
+            batch_size=variant.get("batch_size", 1),
+            client=client,
+            usage=usage,
+        )
+        latency = time.perf_counter() - start
+
+        precision, recall = precision_recall_at_k(matches_df, gold, k)
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        row = {
+            "Variant": name,
+            "Model": model,
+            "top_k": variant.get("top_k", 2),
+            "Max Candidates": variant.get("max_candidates") or "all",
+            "Batch Size": variant.get("batch_size", 1),
+            f"Precision@{k}": round(precision, 3),
+            f"Recall@{k}": round(recall, 3),
+            "Requests": usage.get("requests", 0),
+            "Prompt Tokens": prompt_tokens,
+            "Completion Tokens": completion_tokens,
+            "Est. Cost (USD)": round(estimate_cost(model, prompt_tokens, completion_tokens), 5),
+            "Latency (s)": round(latency, 2),
+        }
+        if replay_path:
+            row["Recorded Latency (s)"] = round(client.recorded_latency_s, 2)
+            row["Replay Misses"] = client.misses
+        rows.append(row)
+
+    report = pd.DataFrame(rows)
+    out_csv = atomic_write_csv(report, resolve_output_dir(output_dir) / "evaluation_report.csv")
+    print("\n📊 Match quality vs. cost\n")
+    print(report.to_string(index=False))
+    print(f"\n✅ Evaluation report saved → {out_csv}")
+    return report
@@ -1,36 +1,56 @@
 import os
 import csv
+import json
+import tempfile
 import subprocess
 from pathlib import Path
 import pandas as pd
-from thinkcerca_tool.config import DATA_DIR
+from thinkcerca_tool.config import DATA_DIR, OUTPUT_DIR, AI_OUTPUT_NAME
+from thinkcerca_tool.modules import artifact_store
+from thinkcerca_tool.modules.workspace import resolve_output_dir, atomic_write_csv, atomic_write_text
 
 # === PATH CONFIGURATION ===
 BASE_DIR = Path(DATA_DIR).parent
 DATA_DIR = BASE_DIR / "data"           # input sources
-OUTPUT_DIR = BASE_DIR / "output"       # all generated outputs
 JSX_DIR = BASE_DIR / "jsx"             # jsx scripts (generated + templates)
-OUTPUT_DIR.mkdir(exist_ok=True)
 
 # === FILE PATHS ===
 INDD_FILE = DATA_DIR / "AI-1-grade-8-student-guide-volume-1.indd"
-MAPPING_XLSX = OUTPUT_DIR / "Grade8_Unit1_Module2_Mapped_Standards_AI_Final.xlsx"
-EXPORT_PDF = OUTPUT_DIR / "AI-1-grade-8-student-guide-volume-1-MAPPED.pdf"
-JSX_FILE = JSX_DIR / "insert_from_python.jsx"
+EXPORT_PDF = Path(OUTPUT_DIR) / "AI-1-grade-8-student-guide-volume-1-MAPPED.pdf"
+JSX_FILE = JSX_DIR / "insert_from_python.jsx"  # default target when no run workspace is used
+CSV_NAME = "standards_for_indesign.csv"        # page → codes payload, written under the output dir
+
+# === FOOTER PLACEMENT (shared with the PDF proof in pdf_proof.py) ===
+FOOTER_BOUNDS = ("8.7in", "1in", "9.1in", "5in")  # InDesign geometricBounds: top, left, bottom, right
+FOOTER_POINT_SIZE = 10
 
 # ==============================================================
 #  CSV EXPORT
 # ==============================================================
-def export_mapping_to_csv():
+def export_mapping_to_csv(output_dir: Path = None) -> Path:
     """
     Export minimal CSV with Page + concatenated Standard codes.
     Ensures proper numeric pages are used.
+    Reads the latest matches from the artifact store; falls back to the mapping Excel.
     """
-    if not MAPPING_XLSX.exists():
-        raise FileNotFoundError(f"❌ Mapping Excel not found → {MAPPING_XLSX}")
+    output_dir = resolve_output_dir(output_dir)
+    mapping_xlsx = output_dir / AI_OUTPUT_NAME
+
+    df = artifact_store.load_matches()
+    if df.empty:
+        if not mapping_xlsx.exists():
+            raise FileNotFoundError(f"❌ No stored matches and mapping Excel not found → {mapping_xlsx}")
+        print(f"⚠️ No matches in artifact store; reading {mapping_xlsx.name}")
+        df = pd.read_excel(mapping_xlsx)
+
+    df_out = build_indesign_payload(df)
+    csv_path = atomic_write_csv(df_out, output_dir / CSV_NAME)
+    print(f"✅ Mapping exported with numeric pages → {csv_path}")
+    return csv_path
 
-    df = pd.read_excel(MAPPING_XLSX)
 
+def build_indesign_payload(df: pd.DataFrame) -> pd.DataFrame:
+    """Collapse match rows to one row per Page with its sorted, comma-joined codes."""
     if "Page" in df.columns and pd.api.types.is_numeric_dtype(df["Page"]):
         group_col = "Page"
     else:
@@ -53,16 +73,13 @@ def export_mapping_to_csv():
     except Exception:
         pass
 
-    csv_path = OUTPUT_DIR / "standards_for_indesign.csv"
-    df_out.to_csv(csv_path, index=False)
-    print(f"✅ Mapping exported with numeric pages → {csv_path}")
-    return csv_path
+    return df_out
 
 
 # ==============================================================
 #  JSX GENERATION (your provided script, unchanged)
 # ==============================================================
-def build_jsx(csv_path: Path):
+def build_jsx(csv_path: Path, jsx_path: Path = JSX_FILE) -> Path:
     jsx_code = f"""
 #target "InDesign"
 (function () {{
@@ -143,11 +160,11 @@ def build_jsx(csv_path: Path):
     // === Keep absolute coordinates (safe) ===
     var tf = page.textFrames.add(overlayLayer);
     // a bit lower than original: from 2–4in to 8.7–9.1in zone
-    tf.geometricBounds = ["8.7in", "1in", "9.1in", "5in"];
+    tf.geometricBounds = {json.dumps(list(FOOTER_BOUNDS))};
     tf.contents = code;  // only codes
 
     var t = tf.texts[0];
-    t.pointSize = 10; // smaller
+    t.pointSize = {FOOTER_POINT_SIZE}; // smaller
     t.justification = Justification.LEFT_ALIGN;
 
     var safeFonts = ["Helvetica", "Arial", "Times-Roman", "Courier"];
@@ -167,9 +184,9 @@ def build_jsx(csv_path: Path):
   alert("🏁 Done inserting small clean codes near footer!");
 }})();
 """
-    JSX_FILE.write_text(jsx_code, encoding="utf-8")
-    print(f"✅ JSX generated successfully → {JSX_FILE}")
-    return JSX_FILE
+    atomic_write_text(jsx_path, jsx_code)
+    print(f"✅ JSX generated successfully → {jsx_path}")
+    return jsx_path
 
 
 # ==============================================================
@@ -177,7 +194,10 @@ def build_jsx(csv_path: Path):
 # ==============================================================
 def run_indesign(js_script: Path):
     js_path = js_script.as_posix()
-    osa_script_path = JSX_DIR / "run_indesign_temp.applescript"
+    # Unique name per launch so parallel runs never share a launcher script
+    fd, osa_name = tempfile.mkstemp(prefix="run_indesign_", suffix=".applescript", dir=js_script.parent)
+    os.close(fd)
+    osa_script_path = Path(osa_name)
 
     osa_code = f'''
     tell application id "com.adobe.InDesign"
@@ -188,17 +208,20 @@ def run_indesign(js_script: Path):
     osa_script_path.write_text(osa_code, encoding="utf-8")
 
     print(f"🚀 Launching InDesign automation via {osa_script_path}")
-    subprocess.run(["osascript", str(osa_script_path)], check=True)
-    osa_script_path.unlink(missing_ok=True)
+    try:
+        subprocess.run(["osascript", str(osa_script_path)], check=True)
+    finally:
+        osa_script_path.unlink(missing_ok=True)
     print("✅ InDesign finished processing.")
 
 
 # ==============================================================
 #  MAIN ENTRY
 # ==============================================================
-def run_full_pipeline():
-    csv_path = export_mapping_to_csv()
-    jsx_path = build_jsx(csv_path)
+def run_full_pipeline(output_dir: Path = None):
+    """CSV → JSX → InDesign. With a run workspace, the JSX is written there instead of jsx/."""
+    csv_path = export_mapping_to_csv(output_dir)
+    jsx_path = build_jsx(csv_path, JSX_FILE if output_dir is None else Path(output_dir) / JSX_FILE.name)
     run_indesign(jsx_path)
 
 if __name__ == "__main__":
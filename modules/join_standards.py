@@ -1,18 +1,17 @@
 import re
 import pandas as pd
-from pathlib import Path
+from thinkcerca_tool.modules import artifact_store
 from thinkcerca_tool.modules.standards_loader import extract_standards, load_reference_1
 from thinkcerca_tool.modules.standards_descriptions import load_standard_descriptions
-from thinkcerca_tool.config import DATA_DIR
 
-# --- Define output directory ---
-OUTPUT_DIR = Path(DATA_DIR).parent / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
-
-def join_module_standards() -> pd.DataFrame:
+def join_module_standards(
+    module_df: pd.DataFrame = None,
+    desc_df: pd.DataFrame = None,
+) -> pd.DataFrame:
     """
     Combine module-specific standards (Reference 1)
     with Grade 8 CCSS descriptions (Reference 2).
+    Either input can be passed in pre-loaded; missing ones are read from disk.
 
     Returns:
         DataFrame with columns:
@@ -20,9 +19,10 @@ def join_module_standards() -> pd.DataFrame:
     """
 
     # --- Load both data sources ---
-    sheets = load_reference_1()
-    module_df = extract_standards(sheets)
-    desc_df = load_standard_descriptions()
+    if module_df is None:
+        module_df = extract_standards(load_reference_1())
+    if desc_df is None:
+        desc_df = load_standard_descriptions()
 
     # --- Detect standard codes like CCSS.L.8.6 or L.8.6.B ---
     code_pattern = re.compile(r"(?:CCSS\.)?([A-Z]{1,3}\.\d{1,2}\.\d+[A-Z]?)", re.IGNORECASE)
@@ -59,9 +59,20 @@ def join_module_standards() -> pd.DataFrame:
     df_out.drop_duplicates(subset=["Standard_Code", "sheet"], inplace=True)
     df_out.reset_index(drop=True, inplace=True)
 
-    # 💾 Save joined dataset to /output
-    out_path = OUTPUT_DIR / "joined_standards.csv"
-    df_out.to_csv(out_path, index=False)
-    print(f"✅ Joined standards saved → {out_path}")
+    # 💾 Save joined dataset to the artifact store (module_standards)
+    artifact_store.save_module_standards(df_out)
+    print(f"✅ Joined standards saved → artifact store ({len(df_out)} rows)")
 
     return df_out
+
+
+def load_joined_standards() -> pd.DataFrame:
+    """
+    Joined module standards from the artifact store (this run's, else the latest).
+    Only parses both workbooks and joins them when nothing has been stored yet.
+    """
+    df = artifact_store.load_module_standards()
+    if df.empty:
+        return join_module_standards()
+    print(f"♻️  Using joined standards from artifact store ({len(df)} rows)")
+    return df
@@ -0,0 +1,117 @@
+import re
+import fitz  # PyMuPDF
+import pandas as pd
+from pathlib import Path
+from thinkcerca_tool.config import FILES, PAGE_OFFSET
+from thinkcerca_tool.modules.indesign_bridge import (
+    FOOTER_BOUNDS,
+    FOOTER_POINT_SIZE,
+    export_mapping_to_csv,
+)
+from thinkcerca_tool.modules.workspace import resolve_output_dir, atomic_path
+
+POINTS_PER_INCH = 72
+OVERSET_RED = (0.9, 0, 0)  # same colour InDesign uses for its overset marker
+
+
+def _to_points(measure: str) -> float:
+    """'8.7in' → 626.4 (points). Bare numbers are taken as points, like InDesign."""
+    m = re.fullmatch(r"\s*([\d.]+)\s*(in|pt)?\s*", measure)
+    if not m:
+        raise ValueError(f"Unsupported measurement: {measure!r}")
+    value = float(m.group(1))
+    return value * POINTS_PER_INCH if m.group(2) == "in" else value
+
+
+def footer_rect() -> fitz.Rect:
+    """The JSX footer frame as a PDF rectangle (geometricBounds are top, left, bottom, right)."""
+    top, left, bottom, right = (_to_points(v) for v in FOOTER_BOUNDS)
+    return fitz.Rect(left, top, right, bottom)
+
+
+def _insert(page, rect: fitz.Rect, text: str) -> float:
+    return page.insert_textbox(
+        rect, text, fontsize=FOOTER_POINT_SIZE, fontname="helv", color=(0, 0, 0), align=fitz.TEXT_ALIGN_LEFT
+    )
+
+
+def _mark_overset(page, rect: fitz.Rect):
+    """Small red '+' box at the frame's bottom-right corner, like InDesign's out port."""
+    port = fitz.Rect(rect.x1 - 8, rect.y1 - 8, rect.x1, rect.y1)
+    page.draw_rect(port, color=OVERSET_RED, fill=(1, 1, 1), width=0.75)
+    page.insert_text((port.x0 + 1.6, port.y1 - 1.4), "+", fontsize=8, fontname="helv", color=OVERSET_RED)
+
+
+def _stamp_codes(page, rect: fitz.Rect, text: str) -> int:
+    """
+    Stamp the codes into the fixed JSX footer frame at the JSX point size.
+    Like an overset InDesign frame, only the codes that fit are shown, followed by
+    an overset marker. Returns how many codes were hidden.
+    (insert_textbox writes nothing when text overflows, so each attempt is clean.)
+    """
+    codes = [c.strip() for c in text.split(",") if c.strip()]
+    for shown in range(len(codes), 0, -1):
+        if _insert(page, rect, ", ".join(codes[:shown])) >= 0:
+            break
+    else:
+        shown = 0
+    if shown < len(codes):
+        _mark_overset(page, rect)
+    return len(codes) - shown
+
+
+# ============================================================
+#  PROOF STAMPING
+# ============================================================
+def stamp_proof_pdf(
+    csv_path: Path = None,
+    pdf_path: str = FILES["STUDENT_GUIDE"],
+    output_dir: Path = None,
+) -> Path:
+    """
+    Linux-friendly stand-in for the InDesign round trip: stamp each page's
+    standard codes from standards_for_indesign.csv onto the Student Guide PDF,
+    in the same footer frame and point size the JSX uses. All pages are written in one save.
+    Pages whose codes overset the frame are marked and reported, as InDesign would hide them.
+    """
+    output_dir = resolve_output_dir(output_dir)
+    if csv_path is None:
+        csv_path = export_mapping_to_csv(output_dir)
+    out_path = output_dir / f"{Path(pdf_path).stem}-PROOF.pdf"
+
+    mapping = pd.read_csv(csv_path)
+    rect = footer_rect()
+
+    doc = fitz.open(pdf_path)
+    stamped, skipped, overset = 0, [], {}
+    for _, row in mapping.iterrows():
+        code = str(row.get("Standard Code", "")).strip()
+        try:
+            page_num = int(row["Page"])
+        except (TypeError, ValueError):
+            continue
+        if not code or code == "nan":
+            continue
+
+        # CSV pages are InDesign page names; undo the PDF → InDesign offset
+        page_idx = page_num - 1 - PAGE_OFFSET
+        if not 0 <= page_idx < len(doc):
+            skipped.append(page_num)
+            continue
+
+        hidden = _stamp_codes(doc[page_idx], rect, code)
+        if hidden:
+            overset[page_num] = hidden
+        else:
+            stamped += 1
+
+    with atomic_path(out_path) as tmp_path:
+        doc.save(tmp_path, garbage=3, deflate=True)
+    doc.close()
+
+    if skipped:
+        print(f"⚠️ Skipped pages outside the PDF (offset +{PAGE_OFFSET}): {skipped}")
+    if overset:
+        print(f"❌ Footer overset (codes hidden, marked in red) on pages: {overset}")
+    print(f"✅ Proof stamped in full on {stamped} pages → {out_path}")
+    return out_path
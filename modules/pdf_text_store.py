@@ -0,0 +1,190 @@
+import os
+import json
+import mmap
+import hashlib
+import fitz  # PyMuPDF
+from pathlib import Path
+from thinkcerca_tool.config import CACHE_DIR
+from thinkcerca_tool.modules.workspace import atomic_path, atomic_write_text
+
+# --- Store directory (shared across runs, keyed by PDF content hash) ---
+STORE_DIR = Path(CACHE_DIR) / "pdf_text"
+STORE_VERSION = 1
+
+# In-process memo of {(path, size, mtime): sha256} so repeated opens skip re-hashing
+_HASH_MEMO: dict = {}
+
+
+# ============================================================
+#  HASHING
+# ============================================================
+def pdf_content_hash(pdf_path) -> str:
+    """
+    SHA-256 of the PDF bytes. Memoized per (path, size, mtime) within the process.
+    """
+    stat = os.stat(pdf_path)
+    memo_key = (str(pdf_path), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _HASH_MEMO:
+        return _HASH_MEMO[memo_key]
+
+    h = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    for key in [k for k in _HASH_MEMO if k[0] == memo_key[0]]:
+        del _HASH_MEMO[key]  # older versions of this file
+    _HASH_MEMO[memo_key] = digest
+    return digest
+
+
+# ============================================================
+#  BUILD
+# ============================================================
+def _build_store(pdf_path, bin_path: Path, idx_path: Path):
+    """
+    Parse every page once and write two files:
+      <hash>.bin → concatenated UTF-8 page text + JSON-encoded block layouts
+      <hash>.idx → JSON index of byte offsets per page
+    Both are written to temp files and renamed, so readers never see partial data;
+    if parsing fails partway the temp files are removed.
+    """
+    pages = []
+    offset = 0
+
+    doc = fitz.open(pdf_path)
+    try:
+        with atomic_path(bin_path) as tmp_bin, open(tmp_bin, "wb") as out:
+            for page in doc:
+                text = page.get_text("text").encode("utf-8")
+                blocks = json.dumps(
+                    [
+                        [round(b[0], 2), round(b[1], 2), round(b[2], 2), round(b[3], 2), b[4], b[5], b[6]]
+                        for b in page.get_text("blocks")
+                    ],
+                    ensure_ascii=False,
+                ).encode("utf-8")
+
+                out.write(text)
+                out.write(blocks)
+                pages.append(
+                    {
+                        "text": [offset, offset + len(text)],
+                        "blocks": [offset + len(text), offset + len(text) + len(blocks)],
+                        "size": [page.rect.width, page.rect.height],
+                    }
+                )
+                offset += len(text) + len(blocks)
+    finally:
+        doc.close()
+
+    # Data first, index last: an index only ever points at a complete .bin
+    index = {"version": STORE_VERSION, "source": str(pdf_path), "page_count": len(pages), "pages": pages}
+    atomic_write_text(idx_path, json.dumps(index))
+    print(f"✅ PDF text store built ({len(pages)} pages) → {bin_path}")
+
+
+# ============================================================
+#  STORE
+# ============================================================
+class PdfTextStore:
+    """
+    Read-only view over the cached text of one PDF.
+    The .bin file is memory-mapped on first access; page text is a slice, not a parse.
+    """
+
+    def __init__(self, pdf_path, store_dir: Path = STORE_DIR):
+        self.pdf_path = str(pdf_path)
+        self.doc_hash = pdf_content_hash(pdf_path)
+
+        store_dir = Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        self.bin_path = store_dir / f"{self.doc_hash}.bin"
+        self.idx_path = store_dir / f"{self.doc_hash}.idx"
+
+        self._index = self._load_index()
+        if self._index is None:
+            _build_store(self.pdf_path, self.bin_path, self.idx_path)
+            self._index = self._load_index()
+
+        self._file = None
+        self._mm = None
+
+    def _load_index(self):
+        if not (self.idx_path.exists() and self.bin_path.exists()):
+            return None
+        try:
+            index = json.loads(self.idx_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if index.get("version") != STORE_VERSION:
+            return None
+        return index
+
+    def _buffer(self):
+        if self._mm is None:
+            self._file = open(self.bin_path, "rb")
+            if os.fstat(self._file.fileno()).st_size == 0:
+                self._mm = b""  # mmap refuses empty files (PDF with no text)
+            else:
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def __len__(self) -> int:
+        return self._index["page_count"]
+
+    def page_text(self, page_idx: int) -> str:
+        """Plain text of a 0-based page, equivalent to page.get_text("text")."""
+        start, end = self._index["pages"][page_idx]["text"]
+        return self._buffer()[start:end].decode("utf-8")
+
+    def page_blocks(self, page_idx: int) -> list:
+        """Block layout of a 0-based page: [x0, y0, x1, y1, text, block_no, block_type]."""
+        start, end = self._index["pages"][page_idx]["blocks"]
+        return json.loads(self._buffer()[start:end].decode("utf-8"))
+
+    def page_size(self, page_idx: int) -> tuple:
+        """(width, height) of a 0-based page in points."""
+        return tuple(self._index["pages"][page_idx]["size"])
+
+    def iter_pages(self):
+        """Yield (page_idx, text) for every page, lazily."""
+        for page_idx in range(len(self)):
+            yield page_idx, self.page_text(page_idx)
+
+    def close(self):
+        if self._mm is not None and not isinstance(self._mm, bytes):
+            self._mm.close()
+        if self._file is not None:
+            self._file.close()
+        self._mm = None
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Process-wide cache of open stores, keyed by PDF path, so repeated callers share one mmap
+_OPEN_STORES: dict = {}
+
+
+def open_text_store(pdf_path, store_dir: Path = STORE_DIR) -> PdfTextStore:
+    """
+    Return the PdfTextStore for a PDF, building it on first use.
+    Stores are reused within the process for as long as the file content is unchanged;
+    when the content changes, the previous store's mmap is closed. Its cache files stay
+    on disk (keyed by content hash), so reverting the PDF does not force a re-parse.
+    """
+    key = str(pdf_path)
+    doc_hash = pdf_content_hash(pdf_path)
+    store = _OPEN_STORES.get(key)
+    if store is not None and store.doc_hash == doc_hash:
+        return store
+
+    _OPEN_STORES[key] = PdfTextStore(pdf_path, store_dir)
+    if store is not None:
+        store.close()
+    return _OPEN_STORES[key]
@@ -0,0 +1,167 @@
+import heapq
+import pandas as pd
+from pathlib import Path
+from thinkcerca_tool.config import (
+    MODEL_NAME,
+    MAX_CANDIDATES,
+    BATCH_SIZE,
+    AI_CONCURRENCY,
+    EST_REQUEST_OVERHEAD_S,
+    EST_INPUT_TOKENS_PER_S,
+    EST_OUTPUT_TOKENS_PER_S,
+)
+from thinkcerca_tool.modules.join_standards import load_joined_standards
+from thinkcerca_tool.modules.ai_matcher import extract_pdf_activities, build_requests
+from thinkcerca_tool.modules.evaluation import estimate_cost
+from thinkcerca_tool.modules.workspace import resolve_output_dir, atomic_write_csv
+
+# Rough size of the JSON the model sends back (per match and per activity/request wrapper)
+OUTPUT_TOKENS_PER_MATCH = 45
+OUTPUT_TOKENS_PER_ACTIVITY = 15
+OUTPUT_TOKENS_PER_REQUEST = 15
+MESSAGE_OVERHEAD_TOKENS = 7  # chat framing around a single user message
+
+# Pruning / batching settings always shown next to the configured one
+COMPARE_SETTINGS = [(None, 1), (15, 1), (None, 4), (15, 4)]
+
+
+# ============================================================
+#  TOKEN COUNTING
+# ============================================================
+def _encoder(model: str):
+    """tiktoken encoder if installed (optional dependency), else None."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, encoder=None) -> int:
+    """Exact count with tiktoken; otherwise the usual ~4 characters per token estimate."""
+    if encoder is not None:
+        return len(encoder.encode(text))
+    return max(1, round(len(text) / 4))
+
+
+# ============================================================
+#  ESTIMATES
+# ============================================================
+def _wall_clock(latencies: list[float], concurrency: int) -> float:
+    """Makespan when requests are handed, in order, to the first free of N workers."""
+    workers = [0.0] * max(1, concurrency)
+    for latency in latencies:
+        heapq.heappush(workers, heapq.heappop(workers) + latency)
+    return max(workers)
+
+
+def _size_requests(requests: list, top_k: int, encoder=None) -> tuple:
+    """(input tokens, estimated output tokens, per-request latencies) for prepared requests."""
+    input_tokens, output_tokens, latencies = 0, 0, []
+    for batch, prompt in requests:
+        req_in = count_tokens(prompt, encoder) + MESSAGE_OVERHEAD_TOKENS
+        req_out = OUTPUT_TOKENS_PER_REQUEST + len(batch) * (OUTPUT_TOKENS_PER_ACTIVITY + top_k * OUTPUT_TOKENS_PER_MATCH)
+        input_tokens += req_in
+        output_tokens += req_out
+        latencies.append(
+            EST_REQUEST_OVERHEAD_S + req_in / EST_INPUT_TOKENS_PER_S + req_out / EST_OUTPUT_TOKENS_PER_S
+        )
+    return input_tokens, output_tokens, latencies
+
+
+def estimate_plan(
+    activities: list[dict],
+    standards_df: pd.DataFrame,
+    model: str = MODEL_NAME,
+    top_k: int = 2,
+    max_candidates: int = MAX_CANDIDATES,
+    batch_size: int = BATCH_SIZE,
+    concurrency: int = AI_CONCURRENCY,
+    encoder=None,
+) -> dict:
+    """
+    Build every prompt for one setting (nothing is sent) and total up its cost and time.
+    The default pipeline batches across pages; --stream rebuilds requests per page, so
+    its requests, tokens and cost are reported separately next to its concurrent time.
+    """
+    requests = build_requests(activities, standards_df, top_k, max_candidates, batch_size)
+    input_tokens, output_tokens, latencies = _size_requests(requests, top_k, encoder)
+
+    pages = {}
+    for act in activities:
+        pages.setdefault(act["page"], []).append(act)
+    stream_requests = [
+        req for page_acts in pages.values()
+        for req in build_requests(page_acts, standards_df, top_k, max_candidates, batch_size)
+    ]
+    stream_in, stream_out, stream_latencies = _size_requests(stream_requests, top_k, encoder)
+
+    return {
+        "Max Candidates": max_candidates or "all",
+        "Batch Size": batch_size,
+        "Requests": len(requests),
+        "Input Tokens": input_tokens,
+        "Output Tokens (est.)": output_tokens,
+        "Est. Cost (USD)": round(estimate_cost(model, input_tokens, output_tokens), 5),
+        "Sequential (s)": round(sum(latencies), 1),
+        "Stream Requests": len(stream_requests),
+        "Stream Input Tokens": stream_in,
+        "Stream Output Tokens (est.)": stream_out,
+        "Stream Est. Cost (USD)": round(estimate_cost(model, stream_in, stream_out), 5),
+        f"Concurrent x{concurrency} (s)": round(_wall_clock(stream_latencies, concurrency), 1),
+    }
+
+
+# ============================================================
+#  DRY RUN
+# ============================================================
+def run_plan(
+    model: str = MODEL_NAME,
+    top_k: int = 2,
+    concurrency: int = AI_CONCURRENCY,
+    settings: list[tuple] = None,
+    output_dir: Path = None,
+    standards_df: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """
+    --plan: run extraction and standards loading, then estimate requests, tokens,
+    cost and wall-clock time for the configured pruning/batching setting and for
+    each comparison setting. No API calls are made.
+    """
+    if standards_df is None:
+        print("🔍 Loading module-specific standards...")
+        standards_df = load_joined_standards()
+
+    print("📘 Extracting student-guide activities...")
+    activities = extract_pdf_activities()
+
+    encoder = _encoder(model)
+    if encoder is None:
+        print("ℹ️  tiktoken not installed — estimating tokens at ~4 characters per token")
+
+    configured = (MAX_CANDIDATES, BATCH_SIZE)
+    settings = settings or [configured] + [s for s in COMPARE_SETTINGS if s != configured]
+
+    rows = []
+    for max_candidates, batch_size in settings:
+        row = {"Setting": "configured" if (max_candidates, batch_size) == configured else "compare"}
+        row.update(
+            estimate_plan(activities, standards_df, model, top_k, max_candidates, batch_size, concurrency, encoder)
+        )
+        rows.append(row)
+
+    report = pd.DataFrame(rows)
+    out_csv = atomic_write_csv(report, resolve_output_dir(output_dir) / "plan_report.csv")
+
+    print(f"\n🧮 Dry-run plan for {len(activities)} activities × {len(standards_df)} candidate standards ({model})\n")
+    print(report.to_string(index=False))
+    print(
+        f"\nℹ️  Time assumes {EST_REQUEST_OVERHEAD_S}s per request + {EST_INPUT_TOKENS_PER_S:g} input tokens/s "
+        f"+ {EST_OUTPUT_TOKENS_PER_S:g} output tokens/s; "
+        "'Sequential' is the default pipeline; 'Stream …' and 'Concurrent' are --stream (per-page batches)."
+    )
+    print(f"✅ Plan saved → {out_csv}")
+    return report
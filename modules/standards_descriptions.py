@@ -1,23 +1,16 @@
 import pandas as pd
-from pathlib import Path
-from thinkcerca_tool.config import FILES, DATA_DIR
-
-# --- Define output directory ---
-OUTPUT_DIR = Path(DATA_DIR).parent / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
+from thinkcerca_tool.config import FILES
+from thinkcerca_tool.modules import artifact_store
 
 def load_standard_descriptions(path: str = None) -> pd.DataFrame:
     """
     Load CCSS standards descriptions for Grade 8.
     Handles capitalization inconsistencies (e.g., 'CCSS Code', 'CCSS Standard').
     Returns a DataFrame with Standard_Code and Description.
-    Also writes a clean CSV copy to /output for reference.
+    Also stores a clean copy in the artifact store (standards table).
     """
     if path is None:
-        path = FILES["REFERENCE_1"].replace(
-            "_new_ Core National Scope and Sequence",
-            "[AI Lab] ThinkCERCA - ELA MOAC Standards (INTERNAL)"
-        )
+        path = FILES["STANDARDS"]
 
     xls = pd.ExcelFile(path)
     if "Grade 8" not in xls.sheet_names:
@@ -42,9 +35,8 @@ def load_standard_descriptions(path: str = None) -> pd.DataFrame:
 
     subset.reset_index(drop=True, inplace=True)
 
-    # 💾 Save cleaned output for visibility
-    out_path = OUTPUT_DIR / "grade8_standard_descriptions.csv"
-    subset.to_csv(out_path, index=False)
-    print(f"✅ Clean Grade 8 standard descriptions saved → {out_path}")
+    # 💾 Save cleaned output to the artifact store
+    artifact_store.save_standards(subset)
+    print(f"✅ Clean Grade 8 standard descriptions saved → artifact store ({len(subset)} rows)")
 
     return subset
@@ -1,11 +1,7 @@
 import pandas as pd
 import re
-from pathlib import Path
-from thinkcerca_tool.config import FILES, TARGET_GRADE, TARGET_UNIT, TARGET_MODULE, DATA_DIR
-
-# --- Define output directory ---
-OUTPUT_DIR = Path(DATA_DIR).parent / "output"
-OUTPUT_DIR.mkdir(exist_ok=True)
+from thinkcerca_tool.config import FILES, TARGET_GRADE, TARGET_UNIT, TARGET_MODULE
+from thinkcerca_tool.modules import artifact_store
 
 def load_reference_1(path: str = FILES["REFERENCE_1"]) -> dict:
     """
@@ -67,9 +63,8 @@ def extract_standards(sheets: dict) -> pd.DataFrame:
     df_out.drop_duplicates(subset=["context_row"], inplace=True)
     df_out.reset_index(drop=True, inplace=True)
 
-    # 💾 Save automatically to output folder
-    out_path = OUTPUT_DIR / "extracted_standards.csv"
-    df_out.to_csv(out_path, index=False)
-    print(f"✅ Extracted standards saved → {out_path}")
+    # 💾 Save to the artifact store (module_contexts)
+    artifact_store.save_module_contexts(df_out)
+    print(f"✅ Extracted standards saved → artifact store ({len(df_out)} rows)")
 
     return df_out
@@ -0,0 +1,222 @@
+import io
+import csv
+import time
+import queue
+import threading
+import pandas as pd
+from pathlib import Path
+from thinkcerca_tool.config import FILES, MODEL_NAME, MAX_CANDIDATES, BATCH_SIZE, AI_CONCURRENCY, STREAM_QUEUE_SIZE
+from thinkcerca_tool.modules import artifact_store, indesign_bridge
+from thinkcerca_tool.modules.join_standards import load_joined_standards
+from thinkcerca_tool.modules.ai_matcher import (
+    iter_page_activities,
+    build_requests,
+    match_batch,
+    make_client,
+    write_mapping_workbook,
+)
+from thinkcerca_tool.modules.workspace import resolve_output_dir, atomic_write_text
+
+# --- Queue message kinds ---
+_STOP = object()             # worker sentinel on the request queue
+PAGE_EXTRACTED = "page"      # (kind, page, n_requests)
+BATCH_MATCHED = "batch"      # (kind, page, rows)
+WORKER_DONE = "worker_done"
+PRODUCER_FAILED = "failed"   # (kind, None, exception)
+
+PAYLOAD_FLUSH_S = 0.5        # minimum gap between payload CSV rewrites
+
+
+# ============================================================
+#  STAGES
+# ============================================================
+def _produce(pdf_path, standards_df, request_q, result_q, top_k, max_candidates, batch_size, n_workers, activities):
+    """Extract page by page and enqueue prompts; blocks when the matchers fall behind."""
+    try:
+        for page, page_acts in iter_page_activities(pdf_path):
+            activities.extend(page_acts)
+            requests = build_requests(page_acts, standards_df, top_k, max_candidates, batch_size)
+            # Tell the aggregator how many results this page will produce before any arrive
+            result_q.put((PAGE_EXTRACTED, page, len(requests)))
+            for batch, prompt in requests:
+                request_q.put((batch, prompt))
+    except Exception as e:
+        print(f"❌ Extraction failed: {e}")
+        result_q.put((PRODUCER_FAILED, None, e))
+    finally:
+        for _ in range(n_workers):
+            request_q.put(_STOP)
+
+
+def _consume(client, model, request_q, result_q, usage):
+    """Matcher worker: one request at a time, results go straight to the aggregator."""
+    try:
+        while True:
+            item = request_q.get()
+            if item is _STOP:
+                break
+            batch, prompt = item
+            rows = match_batch(client, batch, prompt, model, usage)
+            result_q.put((BATCH_MATCHED, batch[0]["page"], rows))
+    finally:
+        result_q.put((WORKER_DONE, None, None))  # always, so the aggregator never waits forever
+
+
+class PageAggregator:
+    """
+    Collects match rows as they arrive and keeps a per-page set of codes.
+    Once every request for a page is back, the page is complete and the InDesign
+    payload CSV is rewritten from the completed pages' codes (at most once per
+    flush_interval seconds; flush() writes whatever is still pending).
+    """
+
+    def __init__(self, csv_path: Path, flush_interval: float = PAYLOAD_FLUSH_S):
+        self.csv_path = csv_path
+        self.flush_interval = flush_interval
+        self.expected = {}      # page → requests still outstanding
+        self.codes = {}         # page → {codes}
+        self.rows = []
+        self.complete = set()
+        self.first_page_at = None
+        self._last_write = None
+        self._dirty = False
+
+    def page_extracted(self, page, n_requests):
+        self.expected[page] = self.expected.get(page, 0) + n_requests
+        if self.expected[page] == 0:
+            self._complete(page)  # page had no activities
+
+    def batch_matched(self, page, rows):
+        self.rows.extend(rows)
+        for r in rows:
+            code = str(r["Standard Code"]).strip()
+            if code:
+                self.codes.setdefault(r["Page"], set()).add(code)
+        self.expected[page] -= 1
+        if self.expected[page] == 0:
+            self._complete(page)
+
+    def _complete(self, page):
+        self.complete.add(page)
+        if page not in self.codes:
+            return
+        self._dirty = True
+        now = time.perf_counter()
+        if self._last_write is None or now - self._last_write >= self.flush_interval:
+            self.flush()
+        if self.first_page_at is None:
+            self.first_page_at = now
+        print(f"📄 Page {page} complete → {len(self.codes[page])} codes")
+
+    def flush(self):
+        """Write the payload (same layout as indesign_bridge.build_indesign_payload) if it changed."""
+        if not self._dirty:
+            return
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        writer.writerow(["Page", "Standard Code"])
+        for page in sorted(p for p in self.complete if p in self.codes):
+            writer.writerow([page, ", ".join(sorted(self.codes[page]))])
+        atomic_write_text(self.csv_path, buf.getvalue())
+        self._last_write = time.perf_counter()
+        self._dirty = False
+
+    def matches_df(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.rows, columns=["Page", "Activity", "Standard Code", "Reason"])
+        return df.sort_values("Page", kind="stable").reset_index(drop=True)
+
+
+# ============================================================
+#  PIPELINE
+# ============================================================
+def run_streaming_pipeline(
+    output_dir: Path = None,
+    jsx_path: Path = indesign_bridge.JSX_FILE,
+    pdf_path: str = FILES["STUDENT_GUIDE"],
+    model: str = MODEL_NAME,
+    top_k: int = 2,
+    max_candidates: int = MAX_CANDIDATES,
+    batch_size: int = BATCH_SIZE,
+    concurrency: int = AI_CONCURRENCY,
+    queue_size: int = STREAM_QUEUE_SIZE,
+    client=None,
+    standards_df: pd.DataFrame = None,
+) -> Path:
+    """
+    Streaming variant of run_ai_mapping_pipeline:
+
+        PDF pages ─▶ [bounded queue] ─▶ N matcher workers ─▶ [bounded queue] ─▶ per-page aggregator
+
+    Bounded queues give backpressure, so end-to-end time tracks the slowest
+    stage instead of the sum. The JSX only points at standards_for_indesign.csv, so
+    it is written up front; the aggregator keeps that CSV current as pages complete.
+    The formatted workbook is built once, after the last result.
+    Batches never span pages, so a page completes as soon as its own requests do.
+    """
+    output_dir = resolve_output_dir(output_dir)
+    client = client or make_client()
+    concurrency = max(1, concurrency)
+
+    if standards_df is None:
+        print("🔍 Loading module-specific standards...")
+        standards_df = load_joined_standards()
+
+    request_q = queue.Queue(maxsize=queue_size)
+    result_q = queue.Queue(maxsize=queue_size)
+    activities = []
+    worker_usage = [{} for _ in range(concurrency)]  # one dict per worker, summed at the end
+    aggregator = PageAggregator(output_dir / indesign_bridge.CSV_NAME)
+    indesign_bridge.build_jsx(aggregator.csv_path, jsx_path)
+
+    print(f"🌊 Streaming extraction → {concurrency} matcher(s) → aggregator (queue size {queue_size})...")
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(
+            target=_produce,
+            args=(pdf_path, standards_df, request_q, result_q, top_k, max_candidates, batch_size, concurrency, activities),
+            daemon=True,
+        )
+    ] + [
+        threading.Thread(target=_consume, args=(client, model, request_q, result_q, usage), daemon=True)
+        for usage in worker_usage
+    ]
+    for t in threads:
+        t.start()
+
+    workers_left = concurrency
+    failure = None
+    while workers_left:
+        kind, page, payload = result_q.get()
+        if kind == PAGE_EXTRACTED:
+            aggregator.page_extracted(page, payload)
+        elif kind == BATCH_MATCHED:
+            aggregator.batch_matched(page, payload)
+        elif kind == PRODUCER_FAILED:
+            failure = payload
+        elif kind == WORKER_DONE:
+            workers_left -= 1
+    for t in threads:
+        t.join()
+    aggregator.flush()
+
+    # Partial results are never saved as the run's mapping
+    if failure is not None:
+        raise failure
+    requests_sent = sum(u.get("requests", 0) for u in worker_usage)
+
+    artifact_store.save_activities(activities)
+    matches_df = aggregator.matches_df()
+    if matches_df.empty:
+        print("⚠️ No matches returned — check AI output.")
+        return None
+    artifact_store.save_matches(matches_df)
+
+    workbook = write_mapping_workbook(matches_df, standards_df, activities, output_dir)
+
+    total = time.perf_counter() - start
+    first = (aggregator.first_page_at - start) if aggregator.first_page_at else total
+    print(
+        f"⏱️  Streaming finished in {total:.2f}s (first page payload after {first:.2f}s, "
+        f"{requests_sent} requests, {len(activities)} activities)"
+    )
+    return workbook
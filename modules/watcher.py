@@ -0,0 +1,217 @@
+import os
+import time
+import hashlib
+import pandas as pd
+from pathlib import Path
+from thinkcerca_tool.config import FILES
+from thinkcerca_tool.modules import (
+    standards_loader,
+    standards_descriptions,
+    join_standards,
+    ai_matcher,
+    indesign_bridge,
+    artifact_store,
+)
+from thinkcerca_tool.modules.workspace import resolve_output_dir
+
+# --- Inputs monitored under data/ ---
+WATCHED_INPUTS = {
+    "scope": FILES["REFERENCE_1"],        # Core National Scope and Sequence
+    "descriptions": FILES["STANDARDS"],   # ELA MOAC Standards
+    "guide": FILES["STUDENT_GUIDE"],      # Student Guide PDF
+}
+
+POLL_INTERVAL = 1.0   # seconds between mtime checks
+SETTLE_DELAY = 0.5    # wait for editors to finish writing before reloading
+RETRY_DELAY = 10.0    # wait before retrying a failed refresh when nothing else changed
+
+
+def _snapshot(paths: dict) -> dict:
+    """{name: (mtime_ns, size)} for every watched file; missing files map to None."""
+    snap = {}
+    for name, path in paths.items():
+        try:
+            st = os.stat(path)
+            snap[name] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            snap[name] = None
+    return snap
+
+
+def _activity_key(act: dict) -> tuple:
+    return act["page"], hashlib.sha1(act["text"].encode("utf-8")).hexdigest()
+
+
+def _standards_fingerprint(standards_df: pd.DataFrame) -> str:
+    payload = standards_df[["Standard_Code", "Description"]].to_csv(index=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# ============================================================
+#  WARM SESSION
+# ============================================================
+class WatchSession:
+    """
+    Holds parsed inputs in memory between changes and re-runs only the
+    stages downstream of whichever inputs changed:
+
+        scope        → extract_standards → join_module_standards → AI (all chunks) → export
+        descriptions → join_module_standards → AI (all chunks) → export
+        guide        → extract_pdf_activities → AI (changed chunks) → export
+    """
+
+    def __init__(self, run_ai: bool = False, output_dir: Path = None, jsx_dir: Path = None):
+        self.run_ai = run_ai
+        self.run_id = artifact_store.current_run_id()
+        self.output_dir = resolve_output_dir(output_dir)
+        self.jsx_path = indesign_bridge.JSX_FILE if jsx_dir is None else Path(jsx_dir) / indesign_bridge.JSX_FILE.name
+        self.sheets = None
+        self.module_df = None
+        self.desc_df = None
+        self.standards_df = None
+        self.activities = None
+        # {(standards fingerprint, page, text hash): [match rows]}
+        self.match_cache = {}
+        self.unmatched = 0      # live activities whose last request failed
+
+    def refresh(self, changed: set):
+        """
+        Re-execute the stages affected by the changed input names.
+        The in-memory inputs are only replaced once every stage succeeds, so a failed
+        refresh leaves the session's own state unchanged. Stages that did finish have
+        already written their rows to the artifact store; the watch loop keeps the
+        inputs dirty and the next successful refresh rewrites the store and CSV views.
+        """
+        sheets, module_df, desc_df = self.sheets, self.module_df, self.desc_df
+        standards_df, activities = self.standards_df, self.activities
+        standards_changed = False
+
+        if "scope" in changed or module_df is None:
+            print("\n📘 Reloading scope and sequence...")
+            sheets = standards_loader.load_reference_1()
+            module_df = standards_loader.extract_standards(sheets)
+            standards_changed = True
+
+        if "descriptions" in changed or desc_df is None:
+            print("\n📗 Reloading standard descriptions...")
+            desc_df = standards_descriptions.load_standard_descriptions()
+            standards_changed = True
+
+        if standards_changed:
+            print("\n📙 Re-joining standards...")
+            standards_df = join_standards.join_module_standards(module_df, desc_df)
+
+        guide_changed = "guide" in changed or activities is None
+        if guide_changed and self.run_ai:
+            print("\n📘 Re-extracting student-guide activities...")
+            activities = ai_matcher.extract_pdf_activities()
+
+        if self.run_ai and (standards_changed or guide_changed or self.unmatched):
+            self._remap_and_export(standards_df, activities)
+
+        artifact_store.export_views(self.output_dir)
+
+        self.sheets, self.module_df, self.desc_df = sheets, module_df, desc_df
+        self.standards_df, self.activities = standards_df, activities
+
+    def _remap_and_export(self, standards_df: pd.DataFrame, activities: list[dict]):
+        fingerprint = _standards_fingerprint(standards_df)
+        pending = [
+            act for act in activities
+            if (fingerprint, *_activity_key(act)) not in self.match_cache
+        ]
+
+        if pending:
+            print(f"🤖 Matching {len(pending)} of {len(activities)} activities (others cached)...")
+            answered = []
+            new_df = ai_matcher.match_standards_with_ai(pending, standards_df, save_raw=False, answered=answered)
+            answered_keys = {_activity_key(act) for act in answered}
+            # Only successful replies are cached; failed requests are retried on the next refresh
+            for act in pending:
+                if _activity_key(act) not in answered_keys:
+                    continue
+                rows = new_df[(new_df["Page"] == act["page"]) & (new_df["Activity"] == act["heading"])]
+                self.match_cache[(fingerprint, *_activity_key(act))] = rows.to_dict("records")
+        else:
+            print("♻️  All activities already matched for these standards.")
+
+        # Drop entries for old standards versions / removed chunks
+        live = {(fingerprint, *_activity_key(act)) for act in activities}
+        self.match_cache = {k: v for k, v in self.match_cache.items() if k in live}
+
+        self.unmatched = len(live) - len(self.match_cache)
+        if self.unmatched:
+            print(f"⚠️ {self.unmatched} activities got no usable AI reply — they will be retried on the next change")
+
+        rows = [r for act in activities for r in self.match_cache.get((fingerprint, *_activity_key(act)), [])]
+        # Chunks sharing a page + heading pick up each other's rows; keep one copy
+        matches_df = pd.DataFrame(rows, columns=["Page", "Activity", "Standard Code", "Reason"]).drop_duplicates()
+        if matches_df.empty:
+            print("⚠️ No matches returned — check AI output.")
+            return
+
+        artifact_store.save_matches(matches_df)
+        ai_matcher.write_mapping_workbook(matches_df, standards_df, activities, self.output_dir)
+
+        csv_path = indesign_bridge.export_mapping_to_csv(self.output_dir)
+        indesign_bridge.build_jsx(csv_path, self.jsx_path)
+
+
+# ============================================================
+#  WATCH LOOP
+# ============================================================
+def watch(run_ai: bool = False, interval: float = POLL_INTERVAL, output_dir: Path = None, jsx_dir: Path = None):
+    """
+    Long-running mode: keep inputs warm and re-run affected stages whenever
+    a file under data/ changes. Stops on Ctrl+C.
+    """
+    session = WatchSession(run_ai=run_ai, output_dir=output_dir, jsx_dir=jsx_dir)
+
+    print("🔥 Warming up (initial load)...")
+    start = time.perf_counter()
+    session.refresh(set(WATCHED_INPUTS))
+    print(f"⏱️  Initial load finished in {time.perf_counter() - start:.2f}s")
+
+    last = _snapshot(WATCHED_INPUTS)
+    dirty = set()  # inputs whose last refresh failed; retried after RETRY_DELAY or with the next change
+    retry_at = 0.0
+    print(f"\n👀 Watching {len(WATCHED_INPUTS)} inputs (Ctrl+C to stop)...")
+    for name, path in WATCHED_INPUTS.items():
+        print(f"   • {name}: {path}")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = _snapshot(WATCHED_INPUTS)
+            changed = {name for name in current if current[name] != last[name]}
+            if not changed and not (dirty and time.perf_counter() >= retry_at):
+                continue
+
+            detected_at = time.perf_counter()
+            if changed:
+                print(f"\n🔔 Change detected: {', '.join(sorted(changed))}")
+                # Let the writer finish, then take the settled snapshot as the baseline
+                time.sleep(SETTLE_DELAY)
+                last = _snapshot(WATCHED_INPUTS)
+            else:
+                print(f"\n🔁 Retrying failed refresh: {', '.join(sorted(dirty))}")
+
+            # Inputs stay dirty until a refresh that includes them succeeds
+            dirty |= changed
+            missing = [name for name in dirty if last[name] is None]
+            if missing:
+                print(f"⚠️ Input missing, waiting for it to reappear: {', '.join(missing)}")
+                retry_at = time.perf_counter() + RETRY_DELAY
+                continue
+
+            try:
+                session.refresh(dirty)
+            except Exception as e:
+                print(f"❌ Refresh failed (retrying in {RETRY_DELAY:g}s): {e}")
+                retry_at = time.perf_counter() + RETRY_DELAY
+                continue
+            dirty = set()
+
+            print(f"⏱️  Outputs updated {time.perf_counter() - detected_at:.2f}s after change")
+    except KeyboardInterrupt:
+        print("\n👋 Watch mode stopped.")
@@ -0,0 +1,56 @@
+import os
+import uuid
+from pathlib import Path
+from contextlib import contextmanager
+from thinkcerca_tool.config import OUTPUT_DIR, RUNS_DIR
+
+
+def resolve_output_dir(output_dir=None) -> Path:
+    """The output root a stage should write to (defaults to the shared output/ folder)."""
+    output_dir = Path(output_dir or OUTPUT_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
+def create_workspace(run_id: str) -> Path:
+    """Private output folder for one run: output/runs/<run_id>/"""
+    workspace = Path(RUNS_DIR) / run_id
+    workspace.mkdir(parents=True, exist_ok=True)
+    print(f"📂 Run workspace → {workspace}")
+    return workspace
+
+
+# ============================================================
+#  ATOMIC WRITES
+# ============================================================
+@contextmanager
+def atomic_path(path):
+    """
+    Yield a temp path next to `path`; on success it is renamed over `path`,
+    so readers (or a parallel run) never see a half-written file.
+    The temp name keeps the suffix, so openpyxl/PyMuPDF accept it.
+
+        with atomic_path(csv_path) as tmp:
+            df.to_csv(tmp, index=False)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.stem}.{uuid.uuid4().hex[:8]}.tmp{path.suffix}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def atomic_write_text(path, text: str) -> Path:
+    with atomic_path(path) as tmp:
+        tmp.write_text(text, encoding="utf-8")
+    return Path(path)
+
+
+def atomic_write_csv(df, path) -> Path:
+    with atomic_path(path) as tmp:
+        df.to_csv(tmp, index=False)
+    return Path(path)
@@ -0,0 +1,55 @@
+import tempfile
+import pandas as pd
+from pathlib import Path
+from thinkcerca_tool.modules import artifact_store, indesign_bridge
+
+
+def _matches(page, code):
+    return pd.DataFrame({"Page": [page], "Activity": ["a"], "Standard Code": [code], "Reason": ["r"]})
+
+
+def test_runs_only_fall_back_to_their_own_output_root():
+    saved = (artifact_store.ARTIFACT_DB, artifact_store._CURRENT_RUN_ID, artifact_store._CURRENT_OUTPUT_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        artifact_store.ARTIFACT_DB = tmp / "artifacts.sqlite"  # one DB shared by every run below
+        default_out, experiment_out = tmp / "output", tmp / "output" / "runs" / "exp-A"
+        default_out.mkdir()
+        experiment_out.mkdir(parents=True)
+        try:
+            # Experiment in its own workspace
+            artifact_store.start_run("exp-A", output_dir=experiment_out)
+            artifact_store.save_matches(_matches(99, "CCSS.EXP.A"))
+
+            # A later default run must not pick the experiment's matches up
+            artifact_store.start_run("default-1", output_dir=default_out)
+            assert artifact_store.load_matches().empty
+            try:
+                indesign_bridge.export_mapping_to_csv(default_out)
+            except FileNotFoundError:
+                pass
+            else:
+                raise AssertionError("default run exported another workspace's matches")
+
+            # ...but the next default run does reuse its predecessor in the same output root
+            artifact_store.save_matches(_matches(35, "CCSS.RL.8.1"))
+            artifact_store.start_run("default-2", output_dir=default_out)
+            csv_path = indesign_bridge.export_mapping_to_csv(default_out)
+            assert pd.read_csv(csv_path).to_dict("records") == [{"Page": 35, "Standard Code": "CCSS.RL.8.1"}]
+
+            # Re-opening the experiment (same run id) still sees its own rows; explicit run_id reads any run
+            artifact_store.start_run("exp-A", output_dir=experiment_out)
+            assert artifact_store.load_matches()["Page"].tolist() == [99]
+            assert artifact_store.load_matches(run_id="default-1")["Page"].tolist() == [35]
+        finally:
+            artifact_store.ARTIFACT_DB, artifact_store._CURRENT_RUN_ID, artifact_store._CURRENT_OUTPUT_DIR = saved
+
+
+if __name__ == "__main__":
+    checks = [test_runs_only_fall_back_to_their_own_output_root]
+    for check in checks:
+        try:
+            check()
+            print(f"✅ {check.__name__}")
+        except Exception as e:
+            print(f"❌ {check.__name__}: {e!r}")
@@ -0,0 +1,163 @@
+import json
+import math
+import tempfile
+import pandas as pd
+from pathlib import Path
+from types import SimpleNamespace
+from thinkcerca_tool.modules.ai_matcher import prune_candidates, match_standards_with_ai
+from thinkcerca_tool.modules.evaluation import (
+    RecordingClient,
+    ReplayClient,
+    load_gold_mapping,
+    precision_recall_at_k,
+    estimate_cost,
+)
+from thinkcerca_tool.modules.planner import estimate_plan
+
+STANDARDS = pd.DataFrame(
+    {
+        "Standard_Code": ["CCSS.RL.8.1", "CCSS.RL.8.1", "CCSS.W.8.2", "CCSS.L.8.4"],
+        "Description": [
+            "Cite textual evidence that supports analysis of what the text says",
+            "Cite textual evidence that supports analysis of what the text says",
+            "Write informative texts to examine a topic and convey ideas",
+            "Determine the meaning of unknown vocabulary words and phrases",
+        ],
+    }
+)
+
+ACTIVITIES = [
+    {"page": 35, "heading": "Quick Write", "text": "Write informative paragraphs that examine the topic."},
+    {"page": 36, "heading": "Close Reading", "text": "Cite evidence from the text to support your analysis."},
+]
+
+
+class FakeClient:
+    """Stands in for OpenAI: answers every prompt with the same two codes."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        self.calls += 1
+        content = json.dumps(
+            {"matches": [{"code": "CCSS.RL.8.1", "reason": "evidence"}, {"code": "CCSS.W.8.2", "reason": "writing"}]}
+        )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20),
+        )
+
+
+def test_gold_mapping_normalizes_codes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "gold.csv"
+        pd.DataFrame(
+            {"Page": [35, 36, None], "Standard Code": ["W.8.2; ccss.rl.8.1", "CCSS.RL.8.1, L.8.4", "RL.8.2"]}
+        ).to_csv(path, index=False)
+        gold = load_gold_mapping(path)
+    assert gold == {
+        (35, None): {"CCSS.W.8.2", "CCSS.RL.8.1"},
+        (36, None): {"CCSS.RL.8.1", "CCSS.L.8.4"},
+    }
+
+
+def test_precision_recall_at_k():
+    gold = {(35, "a"): {"CCSS.W.8.2"}, (36, "b"): {"CCSS.RL.8.1", "CCSS.L.8.4"}, (37, "c"): {"CCSS.L.8.4"}}
+    matches = pd.DataFrame(
+        {
+            "Page": [35, 35, 35, 36, 36],
+            "Activity": ["a", "a", "a", "b", "b"],
+            "Standard Code": ["W.8.2", "CCSS.RL.8.1", "CCSS.L.8.4", "CCSS.L.8.4", "CCSS.L.8.4"],
+        }
+    )
+    precision, recall = precision_recall_at_k(matches, gold, k=2)
+    # a: 1/2 and 1/1 (third code beyond k); b: 1/2 and 1/2 (duplicate counted once); c: no prediction
+    assert abs(precision - (0.5 + 0.5 + 0) / 3) < 1e-9
+    assert abs(recall - (1 + 0.5 + 0) / 3) < 1e-9
+
+
+def test_page_level_gold_uses_every_activity_on_the_page():
+    gold = {(35, None): {"CCSS.RL.8.1", "CCSS.W.8.2", "CCSS.L.8.4"}, (36, None): {"CCSS.W.8.2"}}
+    matches = pd.DataFrame(
+        {
+            "Page": [35, 35, 35, 35, 35, 36, 36],
+            "Activity": ["a", "a", "b", "b", "c", "d", "d"],
+            "Standard Code": [
+                "CCSS.RL.8.1", "CCSS.RL.8.2",   # a
+                "CCSS.W.8.2", "CCSS.RL.8.1",    # b
+                "CCSS.L.8.4",                   # c
+                "CCSS.W.8.2", "CCSS.RL.8.1",    # d
+            ],
+        }
+    )
+    precision, recall = precision_recall_at_k(matches, gold, k=2)
+    # page 35: predicted {RL.8.1, RL.8.2, W.8.2, L.8.4} → 3/4 precise, 3/3 recalled; page 36: 1/2 and 1/1
+    assert abs(precision - (0.75 + 0.5) / 2) < 1e-9
+    assert abs(recall - 1.0) < 1e-9
+
+
+def test_prune_candidates():
+    assert prune_candidates("anything", STANDARDS, None) is STANDARDS
+    pruned = prune_candidates(ACTIVITIES[1]["text"], STANDARDS, 1)
+    assert pruned["Standard_Code"].tolist() == ["CCSS.RL.8.1"]
+    # Fewer unique standards than the cap → duplicates dropped, nothing else removed
+    assert prune_candidates("text", STANDARDS, 10)["Standard_Code"].tolist() == ["CCSS.RL.8.1", "CCSS.W.8.2", "CCSS.L.8.4"]
+
+
+def test_record_then_replay():
+    with tempfile.TemporaryDirectory() as tmp:
+        log = Path(tmp) / "responses.jsonl"
+        live = FakeClient()
+        recorded = match_standards_with_ai(
+            ACTIVITIES, STANDARDS, save_raw=False, max_candidates=None, batch_size=1, client=RecordingClient(log, live)
+        )
+
+        replay = ReplayClient(log)
+        usage = {}
+        replayed = match_standards_with_ai(
+            ACTIVITIES, STANDARDS, save_raw=False, max_candidates=None, batch_size=1, client=replay, usage=usage
+        )
+        assert live.calls == 2
+        assert replayed.equals(recorded) and len(replayed) == 4
+        assert usage == {"requests": 2, "prompt_tokens": 200, "completion_tokens": 40}
+
+        # A different prompt (pruned candidates) was never recorded → miss, no rows
+        missed = match_standards_with_ai(
+            ACTIVITIES[:1], STANDARDS, save_raw=False, max_candidates=1, batch_size=1, client=replay
+        )
+        assert missed.empty and replay.misses == 1
+
+
+def test_estimate_cost():
+    assert abs(estimate_cost("gpt-4o-mini", 1_000_000, 1_000_000) - 0.75) < 1e-9
+    assert math.isnan(estimate_cost("no-such-model", 1000, 1000))
+
+
+def test_plan_reports_stream_requests_separately():
+    # Two pages, batch of 2: one cross-page request batched, one request per page streamed
+    row = estimate_plan(ACTIVITIES, STANDARDS, model="gpt-4o-mini", batch_size=2, concurrency=2)
+    assert row["Requests"] == 1 and row["Stream Requests"] == 2
+    assert row["Stream Input Tokens"] > row["Input Tokens"]  # instructions + standards sent once per page
+    assert row["Stream Est. Cost (USD)"] == round(
+        estimate_cost("gpt-4o-mini", row["Stream Input Tokens"], row["Stream Output Tokens (est.)"]), 5
+    )
+
+
+if __name__ == "__main__":
+    checks = [
+        test_gold_mapping_normalizes_codes,
+        test_precision_recall_at_k,
+        test_page_level_gold_uses_every_activity_on_the_page,
+        test_prune_candidates,
+        test_record_then_replay,
+        test_estimate_cost,
+        test_plan_reports_stream_requests_separately,
+    ]
+    for check in checks:
+        try:
+            check()
+            print(f"✅ {check.__name__}")
+        except Exception as e:
+            print(f"❌ {check.__name__}: {e!r}")
@@ -0,0 +1,96 @@
+import tempfile
+import fitz  # PyMuPDF
+from pathlib import Path
+from thinkcerca_tool.modules import pdf_text_store
+from thinkcerca_tool.modules.pdf_text_store import PdfTextStore, open_text_store
+
+PAGES = ["Quick Write\n\nWrite an informative paragraph.", "Close Reading — “quotes” and ünïcode", ""]
+
+
+def _make_pdf(path: Path, pages=PAGES):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        if text:
+            page.insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+
+def _count_builds():
+    """Wrap _build_store so a test can see how often a PDF is actually parsed."""
+    calls = []
+    original = pdf_text_store._build_store
+
+    def counting(*args):
+        calls.append(args[0])
+        return original(*args)
+
+    pdf_text_store._build_store = counting
+    return calls, lambda: setattr(pdf_text_store, "_build_store", original)
+
+
+def test_page_text_matches_pymupdf():
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = Path(tmp) / "guide.pdf"
+        _make_pdf(pdf)
+        with PdfTextStore(pdf, Path(tmp) / "store") as store:
+            doc = fitz.open(pdf)
+            assert len(store) == len(doc)
+            for i, page in enumerate(doc):
+                assert store.page_text(i) == page.get_text("text")
+                assert store.page_size(i) == (page.rect.width, page.rect.height)
+                assert len(store.page_blocks(i)) == len(page.get_text("blocks"))
+            doc.close()
+
+
+def test_second_open_does_not_reparse():
+    calls, restore = _count_builds()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf, store_dir = Path(tmp) / "guide.pdf", Path(tmp) / "store"
+            _make_pdf(pdf)
+            PdfTextStore(pdf, store_dir).close()
+            PdfTextStore(pdf, store_dir).close()  # new object, same content hash → reads the cache
+            assert len(calls) == 1
+    finally:
+        restore()
+
+
+def test_changed_pdf_keeps_old_cache():
+    calls, restore = _count_builds()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf, store_dir = Path(tmp) / "guide.pdf", Path(tmp) / "store"
+            _make_pdf(pdf)
+            original_bytes = pdf.read_bytes()
+            first = open_text_store(pdf, store_dir)
+            assert open_text_store(pdf, store_dir) is first
+
+            _make_pdf(pdf, ["Edited page"])
+            second = open_text_store(pdf, store_dir)
+            assert second is not first and second.page_text(0).startswith("Edited page")
+            assert first._mm is None  # superseded mmap closed
+            assert first.bin_path.exists() and first.idx_path.exists()
+
+            pdf.write_bytes(original_bytes)  # revert → old cache is reused, no third parse
+            assert open_text_store(pdf, store_dir).page_text(0) == first.page_text(0)
+            assert len(calls) == 2
+            pdf_text_store._OPEN_STORES.pop(str(pdf)).close()
+            first.close()
+    finally:
+        restore()
+
+
+if __name__ == "__main__":
+    checks = [
+        test_page_text_matches_pymupdf,
+        test_second_open_does_not_reparse,
+        test_changed_pdf_keeps_old_cache,
+    ]
+    for check in checks:
+        try:
+            check()
+            print(f"✅ {check.__name__}")
+        except Exception as e:
+            print(f"❌ {check.__name__}: {e!r}")
@@ -0,0 +1,105 @@
+import tempfile
+import pandas as pd
+from pathlib import Path
+from thinkcerca_tool.modules.ai_matcher import _unpack_matches
+from thinkcerca_tool.modules.indesign_bridge import build_indesign_payload
+from thinkcerca_tool.modules.streaming import PageAggregator, run_streaming_pipeline
+
+BATCH = [
+    {"page": 35, "heading": "Quick Write", "text": "..."},
+    {"page": 35, "heading": "Close Reading", "text": "..."},
+]
+
+
+def _row(page, code):
+    return {"Page": page, "Activity": "a", "Standard Code": code, "Reason": "r"}
+
+
+def test_unpack_single_and_batched():
+    single = _unpack_matches({"matches": [{"code": "CCSS.RL.8.1"}]}, BATCH[:1])
+    assert single == [(BATCH[0], [{"code": "CCSS.RL.8.1"}])]
+
+    batched = _unpack_matches(
+        {
+            "results": [
+                {"index": 2, "matches": [{"code": "CCSS.W.8.2"}]},
+                {"index": 3, "matches": [{"code": "out of range"}]},
+                {"index": "1", "matches": [{"code": "not an int"}]},
+            ]
+        },
+        BATCH,
+    )
+    assert batched == [(BATCH[1], [{"code": "CCSS.W.8.2"}])]
+
+
+def test_page_completes_after_all_its_batches():
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "standards_for_indesign.csv"
+        agg = PageAggregator(csv_path, flush_interval=0)
+
+        agg.page_extracted(35, 2)
+        agg.page_extracted(36, 1)
+        agg.page_extracted(37, 0)  # no activities → complete at once, nothing to write
+        assert agg.complete == {37} and not csv_path.exists()
+
+        agg.batch_matched(36, [_row(36, "CCSS.W.8.2")])
+        agg.batch_matched(35, [_row(35, "CCSS.RL.8.1")])
+        assert agg.complete == {36, 37}
+        assert pd.read_csv(csv_path)["Page"].tolist() == [36]  # page 35 still has a batch out
+
+        agg.batch_matched(35, [_row(35, "CCSS.L.8.4"), _row(35, "CCSS.RL.8.1")])
+        payload = pd.read_csv(csv_path)
+        assert agg.complete == {35, 36, 37}
+        assert payload.to_dict("records") == [
+            {"Page": 35, "Standard Code": "CCSS.L.8.4, CCSS.RL.8.1"},
+            {"Page": 36, "Standard Code": "CCSS.W.8.2"},
+        ]
+        assert agg.matches_df()["Page"].tolist() == [35, 35, 35, 36]
+        # Same payload the sequential export builds from the stored matches
+        assert payload.equals(build_indesign_payload(agg.matches_df()).reset_index(drop=True))
+
+
+def test_payload_writes_are_throttled():
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "standards_for_indesign.csv"
+        agg = PageAggregator(csv_path, flush_interval=3600)
+        agg.page_extracted(35, 1)
+        agg.page_extracted(36, 1)
+        agg.batch_matched(35, [_row(35, "CCSS.RL.8.1")])  # first completed page is written at once
+        agg.batch_matched(36, [_row(36, "CCSS.W.8.2")])
+        assert pd.read_csv(csv_path)["Page"].tolist() == [35]
+        agg.flush()
+        assert pd.read_csv(csv_path)["Page"].tolist() == [35, 36]
+
+
+def test_extraction_failure_is_raised():
+    standards = pd.DataFrame({"Standard_Code": ["CCSS.RL.8.1"], "Description": ["Cite evidence"]})
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            run_streaming_pipeline(
+                output_dir=Path(tmp),
+                jsx_path=Path(tmp) / "insert.jsx",
+                pdf_path=str(Path(tmp) / "missing.pdf"),
+                client=object(),  # never called: extraction fails first
+                standards_df=standards,
+            )
+        except FileNotFoundError:
+            pass
+        else:
+            raise AssertionError("extraction error was swallowed")
+        assert not list(Path(tmp).glob("*.xlsx"))  # no workbook from partial results
+
+
+if __name__ == "__main__":
+    checks = [
+        test_unpack_single_and_batched,
+        test_page_completes_after_all_its_batches,
+        test_payload_writes_are_throttled,
+        test_extraction_failure_is_raised,
+    ]
+    for check in checks:
+        try:
+            check()
+            print(f"✅ {check.__name__}")
+        except Exception as e:
+            print(f"❌ {check.__name__}: {e!r}")
@@ -0,0 +1,86 @@
+import json
+import tempfile
+import pandas as pd
+from pathlib import Path
+from types import SimpleNamespace
+from thinkcerca_tool.modules import artifact_store, ai_matcher, watcher
+
+STANDARDS = pd.DataFrame(
+    {"Standard_Code": ["CCSS.RL.8.1", "CCSS.W.8.2"], "Description": ["Cite evidence", "Write informative texts"]}
+)
+
+
+def _activities(edited: str = "Write an informative paragraph about the topic."):
+    return [
+        {"page": 35, "heading": "Quick Write", "text": edited},
+        {"page": 36, "heading": "Close Reading", "text": "Cite evidence from the text to support your analysis."},
+    ]
+
+
+class FakeClient:
+    """Answers every prompt with one code; fails while fail=True."""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("temporary API error")
+        content = json.dumps({"matches": [{"code": "CCSS.RL.8.1", "reason": "evidence"}]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+
+def test_only_new_or_failed_chunks_are_rematched():
+    client = FakeClient()
+    saved = (artifact_store.ARTIFACT_DB, artifact_store._CURRENT_RUN_ID, artifact_store._CURRENT_OUTPUT_DIR, ai_matcher.make_client)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Private DB + fake client, so nothing touches output/ or the network
+        artifact_store.ARTIFACT_DB = Path(tmp) / "artifacts.sqlite"
+        artifact_store._CURRENT_RUN_ID = None
+        artifact_store._CURRENT_OUTPUT_DIR = None
+        ai_matcher.make_client = lambda: client
+        try:
+            session = watcher.WatchSession(run_ai=True, output_dir=Path(tmp), jsx_dir=Path(tmp))
+
+            session._remap_and_export(STANDARDS, _activities())
+            assert client.calls == 2 and len(session.match_cache) == 2
+
+            session._remap_and_export(STANDARDS, _activities())
+            assert client.calls == 2  # nothing changed → all cached
+
+            edited = _activities("Write an informative essay that examines the topic in depth.")
+            client.fail = True
+            session._remap_and_export(STANDARDS, edited)
+            assert client.calls == 3 and session.unmatched == 1  # failure is not cached
+
+            client.fail = False
+            session._remap_and_export(STANDARDS, edited)
+            assert client.calls == 4 and session.unmatched == 0
+
+            extra = pd.DataFrame({"Standard_Code": ["CCSS.L.8.4"], "Description": ["Vocabulary"]})
+            changed_standards = pd.concat([STANDARDS, extra], ignore_index=True)
+            session._remap_and_export(changed_standards, edited)
+            assert client.calls == 6 and len(session.match_cache) == 2  # new standards → all chunks, old entries dropped
+
+            csv = pd.read_csv(Path(tmp) / "standards_for_indesign.csv")
+            assert csv["Page"].tolist() == [35, 36]
+        finally:
+            (
+                artifact_store.ARTIFACT_DB,
+                artifact_store._CURRENT_RUN_ID,
+                artifact_store._CURRENT_OUTPUT_DIR,
+                ai_matcher.make_client,
+            ) = saved
+
+
+if __name__ == "__main__":
+    checks = [test_only_new_or_failed_chunks_are_rematched]
+    for check in checks:
+        try:
+            check()
+            print(f"✅ {check.__name__}")
+        except Exception as e:
+            print(f"❌ {check.__name__}: {e!r}")